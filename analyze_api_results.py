@@ -4,186 +4,265 @@ Analyze API Extraction Results
 Identifies files without revisions that need screenshot capture
 """
 
-import json
+import gzip
 import os
 import sys
 from datetime import datetime
+from itertools import islice
+from pathlib import Path
 
+from json_io import dumps, loads
 
-def analyze_extraction_results(baseline_file):
+# Reports can list thousands of files; use a larger write buffer than the 8 KiB default
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Shared read-only default for files without a metadata block
+_EMPTY = {}
+
+
+def _load_json(path):
+    """Load a JSON (or gzipped .json.gz) file"""
+    raw = Path(path).read_bytes()
+    if path.endswith('.gz'):
+        raw = gzip.decompress(raw)
+    return loads(raw)
+
+
+def _summarize_file(file_data):
     """
-    Analyze API extraction and identify files needing screenshots
+    Project a baseline file entry onto the fields the analysis reads
     
-    Args:
-        baseline_file: Path to BASELINE.json file
+    Returns:
+        (file_name, file_id, revision_count, comment_count, permission_count)
     """
-    print("=" * 80)
-    print("API EXTRACTION ANALYSIS")
-    print("=" * 80)
-    
-    # Load the baseline
-    print(f"\n📂 Loading: {baseline_file}")
-    
-    if not os.path.exists(baseline_file):
-        print(f"❌ File not found: {baseline_file}")
-        return
-    
-    with open(baseline_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    files = data.get('files', [])
-    session_id = data.get('session_id', 'unknown')
-    
-    print(f"✓ Loaded session: {session_id}")
-    print(f"✓ Total files: {len(files)}")
+    get = file_data.get
+    meta_get = (get('metadata') or _EMPTY).get
+    return (
+        meta_get('name', 'Unknown'),
+        get('file_id') or meta_get('id', 'unknown'),
+        get('revision_count', 0),
+        get('comment_count', 0),
+        get('permission_count', 0),
+    )
+
+
+def _write_json_report(path, header, records):
+    """
+    Write a JSON object made of header fields plus a 'files' array
     
-    # Analyze each file
-    print("\n" + "=" * 80)
-    print("ANALYZING FILES FOR REVISION ACCESS")
-    print("=" * 80)
+    Records are serialized one at a time as they are consumed, so the
+    full list never has to exist in memory. Paths ending in .gz are
+    gzip-compressed at level 1, which keeps up with disk write speed.
+    """
+    if path.endswith('.gz'):
+        opener = gzip.open(path, 'wb', compresslevel=1)
+    else:
+        opener = open(path, 'wb', buffering=WRITE_BUFFER_SIZE)
+    with opener as f:
+        f.write(b'{\n')
+        for key, value in header.items():
+            f.write(b'  ' + dumps(key) + b': ' + dumps(value) + b',\n')
+        f.write(b'  "files": [')
+        separator = b'\n    '
+        for record in records:
+            f.write(separator + dumps(record))
+            separator = b',\n    '
+        f.write(b'\n  ]\n}\n')
+
+
+def analyze_extraction_results(baseline_file, compress=False):
+    """
+    Analyze API extraction and identify files needing screenshots
     
-    files_with_revisions = []
-    files_without_revisions = []
-    files_without_revisions_details = []
+    Args:
+        baseline_file: Path to BASELINE.json (or BASELINE.json.gz) file
+        compress: Write the JSON report and screenshot queue as .json.gz
+    """
+    out = []
+    w = out.append
     
-    for file_data in files:
-        metadata = file_data.get('metadata', {})
-        file_name = metadata.get('name', 'Unknown')
-        file_id = file_data.get('file_id') or metadata.get('id', 'unknown')
-        revision_count = file_data.get('revision_count', 0)
-        comment_count = file_data.get('comment_count', 0)
-        perm_count = file_data.get('permission_count', 0)
+    try:
+        w("=" * 80)
+        w("API EXTRACTION ANALYSIS")
+        w("=" * 80)
         
-        if revision_count > 0:
-            files_with_revisions.append({
-                'name': file_name,
-                'id': file_id,
-                'revisions': revision_count,
-                'comments': comment_count,
-                'permissions': perm_count
-            })
-        else:
-            files_without_revisions.append(file_name)
-            files_without_revisions_details.append({
-                'file_id': file_id,
-                'file_name': file_name,
-                'reason': 'No revisions accessible via API',
-                'comment_count': comment_count,
-                'permission_count': perm_count
-            })
-    
-    # Report
-    print(f"\n✓ Files with complete API access: {len(files_with_revisions)}")
-    print(f"⚠️  Files WITHOUT revisions: {len(files_without_revisions)}")
-    
-    if files_with_revisions:
-        print(f"\n" + "-" * 80)
-        print(f"FILES WITH COMPLETE API ACCESS ({len(files_with_revisions)}):")
-        print("-" * 80)
-        for i, f in enumerate(files_with_revisions[:10], 1):
-            print(f"  {i}. {f['name']}")
-            print(f"     ↳ {f['revisions']} revisions, {f['comments']} comments, {f['permissions']} permissions")
-        if len(files_with_revisions) > 10:
-            print(f"  ... and {len(files_with_revisions) - 10} more")
-    
-    if files_without_revisions:
-        print(f"\n" + "=" * 80)
-        print(f"⚠️  FILES WITHOUT REVISIONS ({len(files_without_revisions)}):")
-        print("=" * 80)
-        print("\nThese files did not provide revision history via the API.")
-        print("This typically means you have view-only or comment-only access.\n")
+        # Load the baseline
+        w(f"\n📂 Loading: {baseline_file}")
+        
+        if not os.path.exists(baseline_file):
+            w(f"❌ File not found: {baseline_file}")
+            return
         
-        for i, fname in enumerate(files_without_revisions, 1):
-            print(f"  {i}. {fname}")
+        data = _load_json(baseline_file)
         
-        print(f"\n" + "-" * 80)
-        print("💡 RECOMMENDATION:")
-        print("-" * 80)
-        print("Use the Hybrid Workflow to capture Activity logs via screenshots:")
-        print("  1. Run: python simple_hybrid_example.py")
-        print("  2. Select the BASELINE file when prompted")
-        print("  3. Follow the guided workflow")
-        print("-" * 80)
+        files = data.get('files', [])
+        session_id = data.get('session_id', 'unknown')
         
-        # Save report
-        base_dir = os.path.dirname(baseline_file)
+        w(f"✓ Loaded session: {session_id}")
+        w(f"✓ Total files: {len(files)}")
         
-        # TXT report
-        txt_report = os.path.join(base_dir, f'session_{session_id}_NEEDS_SCREENSHOTS.txt')
-        with open(txt_report, 'w', encoding='utf-8') as f:
-            f.write("FILES NEEDING SCREENSHOT CAPTURE\n")
-            f.write("=" * 70 + "\n\n")
-            f.write(f"Session ID: {session_id}\n")
-            f.write(f"Analysis Date: {datetime.now().isoformat()}\n")
-            f.write(f"Total Files Analyzed: {len(files)}\n")
-            f.write(f"Files Without Revisions: {len(files_without_revisions)}\n\n")
-            f.write("=" * 70 + "\n\n")
-            f.write("REASON:\n")
-            f.write("These files did not provide revision history via Google Drive API.\n")
-            f.write("This typically means you have view-only or comment-only access.\n\n")
-            f.write("SOLUTION:\n")
-            f.write("Use the hybrid workflow to capture Activity logs via screenshots:\n")
-            f.write("  python simple_hybrid_example.py\n\n")
-            f.write("=" * 70 + "\n\n")
-            f.write("FILE LIST:\n\n")
-            for i, fname in enumerate(files_without_revisions, 1):
-                f.write(f"{i}. {fname}\n")
+        # One timestamp for every artifact produced by this run
+        analysis_date = datetime.now().isoformat()
         
-        print(f"\n✓ TXT report saved: {os.path.basename(txt_report)}")
+        # Analyze each file
+        w("\n" + "=" * 80)
+        w("ANALYZING FILES FOR REVISION ACCESS")
+        w("=" * 80)
         
-        # JSON report
-        json_report = os.path.join(base_dir, f'session_{session_id}_NEEDS_SCREENSHOTS.json')
-        with open(json_report, 'w', encoding='utf-8') as f:
-            json.dump({
+        files_with_revisions = []
+        files_without_revisions_details = []
+        append_with = files_with_revisions.append
+        append_without = files_without_revisions_details.append
+        
+        for file_name, file_id, revision_count, comment_count, perm_count in map(_summarize_file, files):
+            if revision_count > 0:
+                append_with({
+                    'name': file_name,
+                    'id': file_id,
+                    'revisions': revision_count,
+                    'comments': comment_count,
+                    'permissions': perm_count
+                })
+            else:
+                append_without({
+                    'file_id': file_id,
+                    'file_name': file_name,
+                    'reason': 'No revisions accessible via API',
+                    'comment_count': comment_count,
+                    'permission_count': perm_count
+                })
+        
+        # Report
+        w(f"\n✓ Files with complete API access: {len(files_with_revisions)}")
+        w(f"⚠️  Files WITHOUT revisions: {len(files_without_revisions_details)}")
+        
+        if files_with_revisions:
+            w(f"\n" + "-" * 80)
+            w(f"FILES WITH COMPLETE API ACCESS ({len(files_with_revisions)}):")
+            w("-" * 80)
+            for i, f in islice(enumerate(files_with_revisions, 1), 10):
+                w(f"  {i}. {f['name']}")
+                w(f"     ↳ {f['revisions']} revisions, {f['comments']} comments, {f['permissions']} permissions")
+            if len(files_with_revisions) > 10:
+                w(f"  ... and {len(files_with_revisions) - 10} more")
+        
+        if files_without_revisions_details:
+            w(f"\n" + "=" * 80)
+            w(f"⚠️  FILES WITHOUT REVISIONS ({len(files_without_revisions_details)}):")
+            w("=" * 80)
+            w("\nThese files did not provide revision history via the API.")
+            w("This typically means you have view-only or comment-only access.\n")
+            
+            for i, d in enumerate(files_without_revisions_details, 1):
+                w(f"  {i}. {d['file_name']}")
+            
+            w(f"\n" + "-" * 80)
+            w("💡 RECOMMENDATION:")
+            w("-" * 80)
+            w("Use the Hybrid Workflow to capture Activity logs via screenshots:")
+            w("  1. Run: python simple_hybrid_example.py")
+            w("  2. Select the BASELINE file when prompted")
+            w("  3. Follow the guided workflow")
+            w("-" * 80)
+            
+            # Save report
+            base_dir = os.path.dirname(baseline_file)
+            
+            # TXT report
+            txt_report = os.path.join(base_dir, f'session_{session_id}_NEEDS_SCREENSHOTS.txt')
+            lines = [
+                "FILES NEEDING SCREENSHOT CAPTURE",
+                "=" * 70,
+                "",
+                f"Session ID: {session_id}",
+                f"Analysis Date: {analysis_date}",
+                f"Total Files Analyzed: {len(files)}",
+                f"Files Without Revisions: {len(files_without_revisions_details)}",
+                "",
+                "=" * 70,
+                "",
+                "REASON:",
+                "These files did not provide revision history via Google Drive API.",
+                "This typically means you have view-only or comment-only access.",
+                "",
+                "SOLUTION:",
+                "Use the hybrid workflow to capture Activity logs via screenshots:",
+                "  python simple_hybrid_example.py",
+                "",
+                "=" * 70,
+                "",
+                "FILE LIST:",
+                "",
+            ]
+            lines.extend(f"{i}. {d['file_name']}" for i, d in enumerate(files_without_revisions_details, 1))
+            lines.append("")
+            
+            Path(txt_report).write_bytes('\n'.join(lines).encode('utf-8'))
+            
+            w(f"\n✓ TXT report saved: {os.path.basename(txt_report)}")
+            
+            # JSON report
+            json_ext = '.json.gz' if compress else '.json'
+            json_report = os.path.join(base_dir, f'session_{session_id}_NEEDS_SCREENSHOTS{json_ext}')
+            _write_json_report(json_report, {
                 'session_id': session_id,
-                'analysis_date': datetime.now().isoformat(),
+                'analysis_date': analysis_date,
                 'total_files': len(files),
                 'files_with_revisions': len(files_with_revisions),
-                'files_without_revisions': len(files_without_revisions),
-                'files': files_without_revisions_details
-            }, f, indent=2)
-        
-        print(f"✓ JSON report saved: {os.path.basename(json_report)}")
-        
-        # Create screenshot queue directly (without needing external imports)
-        queue_path = f'screenshot_queue_{session_id}.json'
-        queue_data = {
-            'created': datetime.now().isoformat(),
-            'session_id': session_id,
-            'total_files': len(files_without_revisions),
-            'files': [
+                'files_without_revisions': len(files_without_revisions_details),
+            }, files_without_revisions_details)
+            
+            w(f"✓ JSON report saved: {os.path.basename(json_report)}")
+            
+            # Create screenshot queue directly (without needing external imports)
+            queue_path = f'screenshot_queue_{session_id}{json_ext}'
+            queue_header = {
+                'created': analysis_date,
+                'session_id': session_id,
+                'total_files': len(files_without_revisions_details),
+            }
+            queue_records = (
                 {
-                    'file_name': fname,
-                    'file_id': next((f['file_id'] for f in files_without_revisions_details if f['file_name'] == fname), 'unknown'),
+                    'file_name': d['file_name'],
+                    'file_id': d['file_id'],
                     'reason': 'No revisions accessible via API',
                     'screenshot_tabs': ['Details', 'Activity']
                 }
-                for fname in files_without_revisions
-            ]
-        }
+                for d in files_without_revisions_details
+            )
+            
+            try:
+                _write_json_report(queue_path, queue_header, queue_records)
+                w(f"✓ Screenshot queue created: {queue_path}")
+                w("\n💡 Ready for hybrid workflow! Just run:")
+                w(f"   python simple_hybrid_example.py")
+            except Exception as e:
+                w(f"\n⚠️  Could not create screenshot queue: {e}")
+        else:
+            w(f"\n" + "=" * 80)
+            w("✓✓✓ EXCELLENT! ALL FILES HAVE COMPLETE API ACCESS ✓✓✓")
+            w("=" * 80)
+            w("\nAll files provided complete revision histories.")
+            w("No screenshot capture needed!")
         
-        try:
-            with open(queue_path, 'w', encoding='utf-8') as f:
-                json.dump(queue_data, f, indent=2)
-            print(f"✓ Screenshot queue created: {queue_path}")
-            print("\n💡 Ready for hybrid workflow! Just run:")
-            print(f"   python simple_hybrid_example.py")
-        except Exception as e:
-            print(f"\n⚠️  Could not create screenshot queue: {e}")
-    else:
-        print(f"\n" + "=" * 80)
-        print("✓✓✓ EXCELLENT! ALL FILES HAVE COMPLETE API ACCESS ✓✓✓")
-        print("=" * 80)
-        print("\nAll files provided complete revision histories.")
-        print("No screenshot capture needed!")
-    
-    print("\n" + "=" * 80)
-    print("ANALYSIS COMPLETE")
-    print("=" * 80)
+        w("\n" + "=" * 80)
+        w("ANALYSIS COMPLETE")
+        w("=" * 80)
+
+    finally:
+        # Emit the whole report in a single write
+        sys.stdout.write('\n'.join(out) + '\n')
+        sys.stdout.flush()
 
 
 def main():
-    """Main entry point"""
+    """
+    Main entry point
+    
+    Pass --compress to write the JSON report and screenshot queue as .json.gz
+    """
+    compress = '--compress' in sys.argv[1:]
+    
     print("=" * 80)
     print("API EXTRACTION ANALYZER")
     print("=" * 80)
@@ -197,39 +276,38 @@ def main():
         return
     
     # Find BASELINE files
-    baseline_files = [
-        os.path.join(exports_dir, f) 
-        for f in os.listdir(exports_dir) 
-        if 'BASELINE' in f and f.endswith('.json')
-    ]
+    with os.scandir(exports_dir) as it:
+        baseline_entries = [
+            (entry.path, entry.name, entry.stat().st_size)
+            for entry in it
+            if 'BASELINE' in entry.name and entry.name.endswith(('.json', '.json.gz'))
+        ]
     
-    if not baseline_files:
+    if not baseline_entries:
         print(f"\n❌ No BASELINE.json files found in {exports_dir}")
         print("\n💡 Run forensic_tool_gui_pro.py first to extract API data")
         return
     
-    print(f"\n📂 Found {len(baseline_files)} baseline file(s):")
-    for i, f in enumerate(baseline_files, 1):
-        filename = os.path.basename(f)
-        filesize = os.path.getsize(f)
+    print(f"\n📂 Found {len(baseline_entries)} baseline file(s):")
+    for i, (_, filename, filesize) in enumerate(baseline_entries, 1):
         print(f"   {i}. {filename} ({filesize:,} bytes)")
     
     # Select file
-    if len(baseline_files) == 1:
-        baseline_file = baseline_files[0]
+    if len(baseline_entries) == 1:
+        baseline_file = baseline_entries[0][0]
         print(f"\n✓ Using: {os.path.basename(baseline_file)}")
     else:
         choice = input("\nWhich file to analyze? (1-N): ").strip()
         try:
             idx = int(choice) - 1
-            baseline_file = baseline_files[idx]
+            baseline_file = baseline_entries[idx][0]
             print(f"✓ Using: {os.path.basename(baseline_file)}")
         except:
             print("❌ Invalid choice")
             return
     
     # Analyze
-    analyze_extraction_results(baseline_file)
+    analyze_extraction_results(baseline_file, compress=compress)
 
 
 if __name__ == '__main__':
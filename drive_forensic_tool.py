@@ -5,24 +5,269 @@ Read-only access with comprehensive metadata extraction
 """
 
 import os
-import json
+import sys
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from itertools import islice
+import httplib2
+import google_auth_httplib2
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-import pickle
+from googleapiclient.model import JsonModel
+from json_io import dumps, orjson, read_json, write_json
+from metadata_cache import MetadataCache
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 # READ-ONLY scope - prevents any modifications
 SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
 
+# Every file field worth preserving for forensic documentation
+FORENSIC_FIELDS = (
+    "id, name, mimeType, description, starred, trashed, "
+    "explicitlyTrashed, parents, properties, appProperties, "
+    "spaces, version, webContentLink, webViewLink, iconLink, "
+    "hasThumbnail, thumbnailLink, thumbnailVersion, "
+    "viewedByMe, viewedByMeTime, createdTime, modifiedTime, "
+    "modifiedByMeTime, modifiedByMe, sharedWithMeTime, "
+    "sharingUser, owners, driveId, "
+    "lastModifyingUser, shared, ownedByMe, capabilities, "
+    "viewersCanCopyContent, copyRequiresWriterPermission, "
+    "writersCanShare, permissions, permissionIds, "
+    "hasAugmentedPermissions, folderColorRgb, originalFilename, "
+    "fullFileExtension, fileExtension, md5Checksum, sha1Checksum, "
+    "sha256Checksum, size, quotaBytesUsed, headRevisionId, "
+    "contentHints, imageMediaMetadata, videoMediaMetadata, "
+    "isAppAuthorized, exportLinks, shortcutDetails, "
+    "contentRestrictions, resourceKey, linkShareMetadata, "
+    "labelInfo"
+)
+
+# Comprehensive records fetch permissions through permissions.list (paged,
+# with PERMISSION_FIELDS), so the inline copy is left out of the metadata
+COMPREHENSIVE_METADATA_FIELDS = ", ".join(
+    field for field in FORENSIC_FIELDS.split(", ") if field != "permissions"
+)
+
+# Drive's MIME type for folders
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+# Minimal projection for listing/triage where only identity and timestamps are read
+SUMMARY_FIELDS = "id, name, mimeType, createdTime, modifiedTime, size"
+
+# Partial-response projections for the other resources. Each lists the
+# forensically relevant fields so the server skips unused subtrees.
+ABOUT_FIELDS = "user, storageQuota, maxUploadSize, importFormats, exportFormats"
+DRIVE_FIELDS = (
+    "nextPageToken, "
+    "drives(id, name, createdTime, hidden, restrictions, capabilities)"
+)
+REVISION_FIELDS = (
+    "nextPageToken, "
+    "revisions(id, mimeType, modifiedTime, keepForever, published, "
+    "lastModifyingUser, originalFilename, md5Checksum, size)"
+)
+COMMENT_FIELDS = (
+    "nextPageToken, "
+    "comments(id, author, content, createdTime, modifiedTime, resolved, "
+    "deleted, anchor, quotedFileContent, replies)"
+)
+PERMISSION_FIELDS = (
+    "nextPageToken, "
+    "permissions(id, type, role, emailAddress, domain, displayName, "
+    "expirationTime, deleted, pendingOwner, allowFileDiscovery, "
+    "permissionDetails)"
+)
+
+# Large reports are written in one go; avoid the 8 KiB default buffer
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Drive rejects batch requests with more than 100 calls
+BATCH_LIMIT = 100
+
+# Files per batch when fetching comprehensive data; each file adds four
+# sub-requests, and fuller batches tend to fail with HTTP 500s
+COMPREHENSIVE_FILES_PER_BATCH = 25
+
+# Cache key ("fields") under which whole comprehensive records are stored
+COMPREHENSIVE_CACHE_KEY = 'comprehensive'
+
+# Rate-limit and transient server errors are retried with backoff
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 5
+
+# Drive also signals rate limiting as HTTP 403 with one of these reasons
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+
+# Dropped connections and timeouts, from httplib2 or (mapped onto
+# OSError) the HTTP/2 transport; retried like transient server errors
+TRANSPORT_ERRORS = (OSError, httplib2.HttpLib2Error)
+
+# Everything a Drive API call can fail with once retries are exhausted
+API_ERRORS = (HttpError,) + TRANSPORT_ERRORS
+
+# Units for _format_bytes, one per power of 1024
+BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# File fields holding a single user object / a list of user-like objects
+USER_FIELDS = ('lastModifyingUser', 'sharingUser')
+USER_LIST_FIELDS = ('owners', 'permissions')
+
+# Keep-alive connections held by the shared HTTP/2 client
+HTTP2_MAX_CONNECTIONS = 20
+
+
+def _is_retryable(error):
+    """True if an API error is rate limiting or a transient failure"""
+    if isinstance(error, TRANSPORT_ERRORS):
+        return True
+    status = error.resp.status
+    if status in RETRY_STATUSES:
+        return True
+    if status == 403:
+        content = error.content
+        if isinstance(content, bytes):
+            content = content.decode('utf-8', 'replace')
+        return any(reason in (content or '') for reason in RATE_LIMIT_REASONS)
+    return False
+
+
+def _retry_delay(error, attempt):
+    """Seconds to wait before retry number attempt + 1 after error"""
+    retry_after = error.resp.get('retry-after', '') if isinstance(error, HttpError) else ''
+    if retry_after.isdigit():
+        return int(retry_after)
+    return 2 ** attempt + random.random()
+
+
+class OrjsonModel(JsonModel):
+    """JsonModel that parses API responses with orjson"""
+    
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Same as JsonModel: non-JSON bodies are passed through as text
+            return super().deserialize(content)
+        if self._data_wrapper and 'data' in body:
+            body = body['data']
+        return body
+
+
+class GzipHttp(httplib2.Http):
+    """
+    httplib2.Http that asks Google to gzip every response
+    
+    Google only compresses when the User-Agent contains "gzip". The client
+    library adds this to ordinary API calls but not to the outer batch
+    request, which carries the largest payloads here.
+    """
+    
+    def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+        return super().request(uri, method, body, _gzip_headers(headers), *args, **kwargs)
+
+
+def _gzip_headers(headers):
+    """Copy headers, adding what Google needs to gzip the response"""
+    headers = dict(headers or {})
+    headers.setdefault('accept-encoding', 'gzip, deflate')
+    user_agent = headers.get('user-agent', '')
+    if 'gzip' not in user_agent:
+        headers['user-agent'] = f"{user_agent} (gzip)".strip()
+    return headers
+
+
+class Http2Transport:
+    """
+    httplib2-compatible transport backed by a shared httpx HTTP/2 client
+    
+    googleapiclient only needs request() returning (response, content),
+    so this slots in under AuthorizedHttp. Unlike httplib2.Http the
+    client is thread-safe: every worker multiplexes over the same
+    connection instead of paying its own TCP and TLS handshake.
+    """
+    
+    _client = None
+    _client_lock = threading.Lock()
+    _unsupported = httpx is None
+    
+    def __init__(self):
+        self.timeout = None
+        self.follow_redirects = True
+        self.redirect_codes = frozenset((300, 301, 302, 303, 307, 308))
+    
+    @classmethod
+    def available(cls):
+        """Create the shared client if httpx (with h2) is installed"""
+        if cls._unsupported:
+            return False
+        with cls._client_lock:
+            if cls._client is None:
+                try:
+                    cls._client = httpx.Client(
+                        http2=True,
+                        limits=httpx.Limits(max_keepalive_connections=HTTP2_MAX_CONNECTIONS)
+                    )
+                except ImportError:
+                    # httpx without the h2 extra; don't retry for every connection
+                    cls._unsupported = True
+                    return False
+        return True
+    
+    def request(self, uri, method="GET", body=None, headers=None,
+                redirections=5, connection_type=None, **kwargs):
+        try:
+            response = self._client.request(
+                method,
+                uri,
+                content=body,
+                headers=_gzip_headers(headers),
+                follow_redirects=self.follow_redirects and redirections > 0,
+                timeout=self.timeout
+            )
+        except httpx.TimeoutException as error:
+            # Raise what httplib2 would, so callers and retries treat both alike
+            raise TimeoutError(str(error)) from error
+        except httpx.TransportError as error:
+            raise ConnectionError(str(error)) from error
+        
+        # httpx already decoded the body; describe it the way httplib2 does
+        info = dict(response.headers)
+        if 'content-encoding' in info:
+            info['-content-encoding'] = info.pop('content-encoding')
+            info['content-length'] = str(len(response.content))
+        info['status'] = str(response.status_code)
+        result = httplib2.Response(info)
+        result.reason = response.reason_phrase
+        return result, response.content
+    
+    def close(self):
+        """The client is shared between transports, so nothing to close"""
+
+
 class DriveForensicTool:
-    def __init__(self, credentials_file='credentials.json'):
-        """Initialize the forensic tool with read-only credentials"""
+    def __init__(self, credentials_file='credentials.json', cache_path=None):
+        """
+        Initialize the forensic tool with read-only credentials
+        
+        cache_path: Optional SQLite file for caching file metadata by version
+        """
         self.credentials_file = credentials_file
-        self.token_file = 'token.pickle'
+        self.token_file = 'token.json'
+        self.creds = None
         self.service = None
+        self.cache = MetadataCache(cache_path) if cache_path else None
+        self._refresh_lock = threading.Lock()
+        self._user_pool = {}
         
     def authenticate(self):
         """Authenticate with Google Drive using read-only scope"""
@@ -32,8 +277,7 @@ class DriveForensicTool:
         
         # Check if we have a saved token
         if os.path.exists(self.token_file):
-            with open(self.token_file, 'rb') as token:
-                creds = pickle.load(token)
+            creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
             print("✓ Found saved token")
         
         # If no valid credentials, get new ones
@@ -58,18 +302,54 @@ class DriveForensicTool:
                 print("✓ OAuth completed")
             
             # Save credentials for future use
-            with open(self.token_file, 'wb') as token:
-                pickle.dump(creds, token)
+            self._save_token(creds)
             print("✓ Credentials saved")
         
         try:
-            self.service = build('drive', 'v3', credentials=creds)
+            self.creds = creds
+            # The Drive v3 discovery document ships with google-api-python-client;
+            # static_discovery loads it from the package instead of the network
+            self.service = build(
+                'drive', 'v3',
+                http=self._new_http(),
+                model=OrjsonModel() if orjson is not None else None,
+                static_discovery=True,
+                cache_discovery=False
+            )
             print("✓ Successfully authenticated with READ-ONLY access")
             return True
         except Exception as e:
             print(f"Authentication failed: {e}")
             return False
     
+    def _save_token(self, creds):
+        """Persist credentials to the token file"""
+        with open(self.token_file, 'w', encoding='utf-8') as token:
+            token.write(creds.to_json())
+    
+    def _ensure_fresh(self, skew=60):
+        """
+        Refresh the access token if it expires within `skew` seconds
+        
+        Refreshing up front avoids a failed call followed by a reactive
+        refresh and retry. The token file is only rewritten when the
+        access token actually changed.
+        """
+        creds = self.creds
+        if not creds or not creds.expiry or not creds.refresh_token:
+            return
+        if (creds.expiry - datetime.utcnow()).total_seconds() >= skew:
+            return
+        
+        # Worker threads share creds; only one of them should refresh
+        with self._refresh_lock:
+            if (creds.expiry - datetime.utcnow()).total_seconds() >= skew:
+                return
+            previous_token = creds.token
+            creds.refresh(Request())
+            if creds.token != previous_token:
+                self._save_token(creds)
+    
     def get_about_info(self):
         """Get COMPLETE information about the Drive account"""
         if not self.service:
@@ -79,8 +359,7 @@ class DriveForensicTool:
         try:
             print("Fetching COMPLETE Drive account information...")
             
-            # Request ALL about fields
-            about = self.service.about().get(fields='*').execute()
+            about = self.service.about().get(fields=ABOUT_FIELDS).execute()
             
             user_info = about.get('user', {})
             storage = about.get('storageQuota', {})
@@ -114,18 +393,16 @@ class DriveForensicTool:
                 print(f"✓ Export Formats: {len(about['exportFormats'])} types")
             
             return about
-        except HttpError as error:
+        except API_ERRORS as error:
             print(f"Error fetching about info: {error}")
             return None
     
     def _format_bytes(self, bytes_val):
         """Format bytes to human readable"""
-        bytes_val = float(bytes_val)
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_val < 1024.0:
-                return f"{bytes_val:.2f} {unit}"
-            bytes_val /= 1024.0
-        return f"{bytes_val:.2f} PB"
+        bytes_val = int(bytes_val)
+        # Each unit step is 10 bits, so the unit index falls out of bit_length()
+        idx = min(max(0, (bytes_val.bit_length() - 1) // 10), len(BYTE_UNITS) - 1)
+        return f"{bytes_val / (1 << (idx * 10)):.2f} {BYTE_UNITS[idx]}"
     
     def get_drives_list(self):
         """Get list of all shared drives (Team Drives) user has access to"""
@@ -136,135 +413,367 @@ class DriveForensicTool:
         try:
             print("Fetching shared drives...")
             
-            drives = self.service.drives().list(
-                pageSize=100,
-                fields='*'
-            ).execute()
+            drives_api = self.service.drives()
+            request = drives_api.list(pageSize=100, fields=DRIVE_FIELDS)
+            drive_list = []
+            while request is not None:
+                response = self._execute_with_backoff(request)
+                drive_list.extend(response.get('drives', []))
+                request = drives_api.list_next(request, response)
             
-            drive_list = drives.get('drives', [])
             print(f"✓ Found {len(drive_list)} shared drives")
             
             return drive_list
             
-        except HttpError as error:
+        except API_ERRORS as error:
             print(f"⚠️ Could not fetch shared drives: {error}")
             return []
     
-    def list_files(self, query=None, max_results=100):
-        """List files with ALL available fields"""
+    def list_all_drives_files(self, max_workers=8, fields=None):
+        """
+        Yield every file on every shared drive
+        
+        A single paged files.list over corpora='allDrives' replaces one
+        traversal per drive. If Drive reports the search as incomplete
+        (too many drives to search at once), each drive is listed on its
+        own instead, max_workers at a time.
+        """
         if not self.service:
             print("Not authenticated. Run authenticate() first.")
-            return []
+            return
+        
+        self._ensure_fresh()
+        
+        fields = fields or SUMMARY_FIELDS
+        if 'driveId' not in fields:
+            fields = f"driveId, {fields}"
+        
+        files_api = self.service.files()
+        request = files_api.list(
+            corpora='allDrives',
+            pageSize=1000,
+            fields=f"nextPageToken, incompleteSearch, files({fields})",
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True
+        )
         
         try:
-            # Request ALL available fields for comprehensive metadata
-            fields = (
-                "files(id, name, mimeType, description, starred, trashed, "
-                "explicitlyTrashed, parents, properties, appProperties, "
-                "spaces, version, webContentLink, webViewLink, iconLink, "
-                "hasThumbnail, thumbnailLink, thumbnailVersion, "
-                "viewedByMe, viewedByMeTime, createdTime, modifiedTime, "
-                "modifiedByMeTime, modifiedByMe, sharedWithMeTime, "
-                "sharingUser, owners, teamDriveId, driveId, "
-                "lastModifyingUser, shared, ownedByMe, capabilities, "
-                "viewersCanCopyContent, copyRequiresWriterPermission, "
-                "writersCanShare, permissions, permissionIds, "
-                "hasAugmentedPermissions, folderColorRgb, originalFilename, "
-                "fullFileExtension, fileExtension, md5Checksum, sha1Checksum, "
-                "sha256Checksum, size, quotaBytesUsed, headRevisionId, "
-                "contentHints, imageMediaMetadata, videoMediaMetadata, "
-                "isAppAuthorized, exportLinks, shortcutDetails, "
-                "contentRestrictions, resourceKey, linkShareMetadata, "
-                "labelInfo)"
-            )
-            
-            print(f"Querying Drive API (max {max_results} results)...")
-            if query:
-                print(f"Query: {query}")
-            
-            results = self.service.files().list(
-                q=query,
-                pageSize=max_results,
-                fields=fields,
-                supportsAllDrives=True,
-                includeItemsFromAllDrives=True
-            ).execute()
-            
-            files = results.get('files', [])
-            print(f"✓ Retrieved {len(files)} files")
-            return files
-            
-        except HttpError as error:
+            response = self._execute_with_backoff(request)
+        except API_ERRORS as error:
             print(f"An error occurred: {error}")
+            return
+        
+        if response.get('incompleteSearch'):
+            print("⚠️ Drive could not search all drives at once, listing each drive")
+            yield from self._list_drives_in_parallel(max_workers, fields)
+            return
+        
+        while True:
+            # allDrives also covers My Drive; keep shared drive items only
+            files = [file for file in response.get('files', []) if file.get('driveId')]
+            yield from self._intern_users(files)
+            
+            request = files_api.list_next(request, response)
+            if request is None:
+                return
+            try:
+                response = self._execute_with_backoff(request)
+            except API_ERRORS as error:
+                print(f"An error occurred: {error}")
+                return
+    
+    def _list_drives_in_parallel(self, max_workers, fields):
+        """
+        Yield every file on every shared drive, listing drives in parallel
+        
+        Each worker pages through one drive on its own connection. Files
+        are yielded a drive at a time, in the order the drives finish.
+        """
+        drives = self.get_drives_list()
+        if not drives:
+            return
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._list_drive_files, drive['id'], fields): drive
+                for drive in drives
+            }
+            for future in as_completed(futures):
+                drive = futures[future]
+                try:
+                    files = future.result()
+                except API_ERRORS as error:
+                    print(f"⚠️ Could not list drive {drive.get('name', drive['id'])}: {error}")
+                    continue
+                print(f"✓ {drive.get('name', drive['id'])}: {len(files)} files")
+                yield from files
+    
+    def _list_drive_files(self, drive_id, fields=None):
+        """List all files on one shared drive (runs on a worker thread)"""
+        http = self._new_http()
+        files_api = self.service.files()
+        request = files_api.list(
+            corpora='drive',
+            driveId=drive_id,
+            pageSize=1000,
+            fields=f"nextPageToken, files({fields or SUMMARY_FIELDS})",
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True
+        )
+        
+        files = []
+        while request is not None:
+            response = self._execute_with_backoff(request, http=http)
+            files.extend(response.get('files', []))
+            request = files_api.list_next(request, response)
+        return self._intern_users(files)
+    
+    def list_files(self, query=None, max_results=100, fields=None):
+        """
+        List files matching query
+        
+        fields: Drive field projection per file (default SUMMARY_FIELDS);
+                pass FORENSIC_FIELDS for complete metadata
+        """
+        if not self.service:
+            print("Not authenticated. Run authenticate() first.")
             return []
+        
+        self._ensure_fresh()
+        
+        print(f"Querying Drive API (max {max_results} results)...")
+        if query:
+            print(f"Query: {query}")
+        
+        files = list(self.iter_files(
+            query=query,
+            page_size=min(max_results, 1000),
+            max_results=max_results,
+            fields=fields
+        ))
+        print(f"✓ Retrieved {len(files)} files")
+        return files
     
-    def get_file_metadata(self, file_id):
-        """Get detailed metadata for a specific file with ALL fields"""
+    def iter_files(self, query=None, page_size=1000, max_results=None, fields=None):
+        """
+        Yield files across every result page
+        
+        The next page is fetched in the background while the caller
+        processes the current one. Stops after max_results files if given.
+        """
+        if not self.service:
+            print("Not authenticated. Run authenticate() first.")
+            return
+        
+        self._ensure_fresh()
+        
+        fields = f"nextPageToken, files({fields or SUMMARY_FIELDS})"
+        
+        files_api = self.service.files()
+        request = files_api.list(
+            q=query,
+            pageSize=page_size,
+            fields=fields,
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True
+        )
+        
+        # One connection for the prefetch thread, reused for every page
+        http = self._new_http()
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._execute_with_backoff, request, http)
+            while future is not None:
+                try:
+                    response = future.result()
+                except API_ERRORS as error:
+                    print(f"An error occurred: {error}")
+                    return
+                
+                files = response.get('files', [])
+                if max_results is not None:
+                    files = files[:max_results]
+                    max_results -= len(files)
+                
+                request = files_api.list_next(request, response)
+                if request and max_results != 0:
+                    future = executor.submit(self._execute_with_backoff, request, http)
+                else:
+                    future = None
+                
+                yield from self._intern_users(files)
+    
+    def _new_http(self):
+        """Create an authorized, gzip-enabled connection"""
+        # Prefer the shared HTTP/2 client; otherwise each thread gets its own
+        # httplib2 connection, since those are not thread-safe
+        if Http2Transport.available():
+            return google_auth_httplib2.AuthorizedHttp(self.creds, http=Http2Transport())
+        return google_auth_httplib2.AuthorizedHttp(self.creds, http=GzipHttp())
+    
+    def get_file_metadata(self, file_id, fields=None):
+        """
+        Get metadata for a specific file
+        
+        fields: Drive field projection (default SUMMARY_FIELDS);
+                pass FORENSIC_FIELDS for complete metadata
+        """
         if not self.service:
             print("Not authenticated. Run authenticate() first.")
             return None
         
+        self._ensure_fresh()
+        
         try:
-            print(f"Fetching detailed metadata for file {file_id}...")
-            
-            # Request ALL available fields
-            fields = (
-                "id, name, mimeType, description, starred, trashed, "
-                "explicitlyTrashed, parents, properties, appProperties, "
-                "spaces, version, webContentLink, webViewLink, iconLink, "
-                "hasThumbnail, thumbnailLink, thumbnailVersion, "
-                "viewedByMe, viewedByMeTime, createdTime, modifiedTime, "
-                "modifiedByMeTime, modifiedByMe, sharedWithMeTime, "
-                "sharingUser, owners, teamDriveId, driveId, "
-                "lastModifyingUser, shared, ownedByMe, capabilities, "
-                "viewersCanCopyContent, copyRequiresWriterPermission, "
-                "writersCanShare, permissions, permissionIds, "
-                "hasAugmentedPermissions, folderColorRgb, originalFilename, "
-                "fullFileExtension, fileExtension, md5Checksum, sha1Checksum, "
-                "sha256Checksum, size, quotaBytesUsed, headRevisionId, "
-                "contentHints, imageMediaMetadata, videoMediaMetadata, "
-                "isAppAuthorized, exportLinks, shortcutDetails, "
-                "contentRestrictions, resourceKey, linkShareMetadata, "
-                "labelInfo"
-            )
+            print(f"Fetching metadata for file {file_id}...")
             
-            file_metadata = self.service.files().get(
-                fileId=file_id,
-                fields=fields,
-                supportsAllDrives=True
-            ).execute()
+            fields = fields or SUMMARY_FIELDS
+            version = None
+            if self.cache is not None:
+                # Cheap version probe; unchanged files are served from the cache
+                version = self._metadata_request(file_id, 'id, version').execute().get('version')
+                cached = self.cache.get(file_id, version, fields)
+                if cached is not None:
+                    print(f"✓ Using cached metadata for: {cached.get('name', 'Unknown')}")
+                    return cached
+            
+            file_metadata = self._metadata_request(file_id, fields).execute()
+            
+            if self.cache is not None:
+                self.cache.put(file_id, version, file_metadata, fields)
             
             print(f"✓ Retrieved metadata for: {file_metadata.get('name', 'Unknown')}")
             return file_metadata
             
-        except HttpError as error:
+        except API_ERRORS as error:
             print(f"An error occurred: {error}")
             return None
     
+    def _metadata_request(self, file_id, fields=None):
+        """Build (without executing) a files.get request"""
+        return self.service.files().get(
+            fileId=file_id,
+            fields=fields or SUMMARY_FIELDS,
+            supportsAllDrives=True
+        )
+    
+    def get_file_metadata_batch(self, file_ids, fields=FORENSIC_FIELDS):
+        """
+        Get detailed metadata for many files using batched requests
+        
+        Returns:
+            dict: file_id -> metadata for every file that could be fetched
+        """
+        if not self.service:
+            print("Not authenticated. Run authenticate() first.")
+            return {}
+        
+        self._ensure_fresh()
+        
+        file_ids = list(dict.fromkeys(file_ids))
+        results = {}
+        
+        def callback(request_id, response, exception):
+            if exception is not None:
+                print(f"  ⚠️ Could not fetch metadata for {request_id}: {exception}")
+            else:
+                results[request_id] = response
+        
+        print(f"Fetching detailed metadata for {len(file_ids)} files in batches...")
+        
+        for start in range(0, len(file_ids), BATCH_LIMIT):
+            try:
+                self._execute_batch(
+                    (
+                        (file_id, self._metadata_request(file_id, fields))
+                        for file_id in file_ids[start:start + BATCH_LIMIT]
+                    ),
+                    callback
+                )
+            except API_ERRORS as error:
+                print(f"An error occurred: {error}")
+        
+        self._intern_users(results.values())
+        
+        print(f"✓ Retrieved metadata for {len(results)}/{len(file_ids)} files")
+        return results
+    
+    def _intern_users(self, files):
+        """
+        Make repeated user objects across files share one dict in memory
+        
+        The same owner or last modifying user is repeated inline in every
+        file's metadata. Identical user dicts are replaced by a single
+        pooled instance and their name/email strings are interned. The
+        files serialize exactly as before; treat the shared dicts as
+        read-only.
+        """
+        pool = self._user_pool
+        
+        def shared(user):
+            if not isinstance(user, dict):
+                return user
+            try:
+                key = tuple(sorted(user.items()))
+                cached = pool.get(key)
+            except TypeError:
+                # Nested values (e.g. permissionDetails) - leave as is
+                return user
+            if cached is None:
+                for field in ('emailAddress', 'displayName'):
+                    if isinstance(user.get(field), str):
+                        user[field] = sys.intern(user[field])
+                pool[key] = cached = user
+            return cached
+        
+        for file in files:
+            for field in USER_FIELDS:
+                if field in file:
+                    file[field] = shared(file[field])
+            for field in USER_LIST_FIELDS:
+                if field in file:
+                    file[field] = [shared(user) for user in file[field]]
+        return files
+    
     def get_file_revisions(self, file_id):
         """Get ALL revision history for a file (activity log)"""
         if not self.service:
             print("Not authenticated. Run authenticate() first.")
             return []
         
-        try:
-            print(f"  Fetching revision history...")
-            
-            # Request ALL revision fields
-            revisions = self.service.revisions().list(
-                fileId=file_id,
-                fields='*',
-                pageSize=1000
-            ).execute()
-            
-            revision_list = revisions.get('revisions', [])
-            print(f"  ✓ Found {len(revision_list)} revisions")
+        print(f"  Fetching revision history...")
+        revision_list = list(self.iter_revisions(file_id))
+        print(f"  ✓ Found {len(revision_list)} revisions")
+        
+        return revision_list
+    
+    def iter_revisions(self, file_id, page_token=None, http=None):
+        """Yield every revision of a file, following nextPageToken"""
+        if not self.service:
+            print("Not authenticated. Run authenticate() first.")
+            return
+        
+        while True:
+            try:
+                response = self._revisions_request(file_id, page_token).execute(http=http)
+            except API_ERRORS as error:
+                print(f"  ⚠️ Could not fetch revisions: {error}")
+                return
             
-            return revision_list
+            yield from response.get('revisions', [])
             
-        except HttpError as error:
-            print(f"  ⚠️ Could not fetch revisions: {error}")
-            return []
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return
+    
+    def _revisions_request(self, file_id, page_token=None):
+        """Build (without executing) a revisions.list request"""
+        return self.service.revisions().list(
+            fileId=file_id,
+            fields=REVISION_FIELDS,
+            pageSize=1000,
+            pageToken=page_token
+        )
     
     def get_file_comments(self, file_id):
         """Get ALL comments on a file"""
@@ -275,23 +784,27 @@ class DriveForensicTool:
         try:
             print(f"  Fetching comments...")
             
-            comments = self.service.comments().list(
-                fileId=file_id,
-                fields='*',
-                pageSize=100,
-                includeDeleted=False
-            ).execute()
+            comments = self._comments_request(file_id).execute()
             
             comment_list = comments.get('comments', [])
             print(f"  ✓ Found {len(comment_list)} comments")
             
             return comment_list
             
-        except HttpError as error:
+        except API_ERRORS as error:
             print(f"  ⚠️ Could not fetch comments: {error}")
             return []
     
-    def get_comprehensive_file_data(self, file_id):
+    def _comments_request(self, file_id):
+        """Build (without executing) a comments.list request"""
+        return self.service.comments().list(
+            fileId=file_id,
+            fields=COMMENT_FIELDS,
+            pageSize=100,
+            includeDeleted=False
+        )
+    
+    def get_comprehensive_file_data(self, file_id, http=None):
         """
         Get EVERYTHING about a file:
         - Metadata (all fields)
@@ -301,6 +814,8 @@ class DriveForensicTool:
         - Capabilities
         - Labels
         - Properties
+        
+        http: Optional connection to send the batch on (for worker threads)
         """
         print(f"Getting MAXIMUM comprehensive data for file...")
         
@@ -309,38 +824,339 @@ class DriveForensicTool:
             'fetch_time': datetime.now().isoformat(),
         }
         
-        # Get metadata with EVERY field
-        metadata = self.get_file_metadata(file_id)
+        if not self.service:
+            print("Not authenticated. Run authenticate() first.")
+            return data
+        
+        # Send all four lookups in one batch HTTP round-trip
+        responses = {}
+        
+        def callback(request_id, response, exception):
+            if exception is not None:
+                print(f"  ⚠️ Could not fetch {request_id}: {exception}")
+            else:
+                responses[request_id] = response
+        
+        # Raises rather than return a record with silently missing parts
+        self._execute_batch(self._comprehensive_requests(file_id), callback, http=http)
+        
+        return self._assemble_comprehensive(data, responses, http=http)
+    
+    def iter_comprehensive_file_data(self, file_ids, files_per_batch=COMPREHENSIVE_FILES_PER_BATCH):
+        """
+        Yield comprehensive data for many files, in the order of file_ids
+        
+        The lookups for files_per_batch files are packed into a single
+        batch HTTP round-trip instead of one round-trip per file. file_ids
+        may be any iterable, e.g. a generator over iter_files(); it is only
+        read one batch ahead, so fetching overlaps with listing.
+        """
+        if not self.service:
+            print("Not authenticated. Run authenticate() first.")
+            return
+        
+        file_ids = iter(file_ids)
+        while True:
+            chunk = list(islice(file_ids, files_per_batch))
+            if not chunk:
+                return
+            self._ensure_fresh()
+            responses = {file_id: {} for file_id in chunk}
+            
+            def callback(request_id, response, exception):
+                file_id, _, kind = request_id.rpartition(':')
+                if exception is not None:
+                    print(f"  ⚠️ Could not fetch {kind} for {file_id}: {exception}")
+                else:
+                    responses[file_id][kind] = response
+            
+            # Raises rather than yield records with silently missing parts
+            self._execute_batch(
+                (
+                    (f"{file_id}:{kind}", request)
+                    for file_id in responses
+                    for kind, request in self._comprehensive_requests(file_id)
+                ),
+                callback
+            )
+            
+            fetch_time = datetime.now().isoformat()
+            for file_id in chunk:
+                print(f"Getting MAXIMUM comprehensive data for file...")
+                data = {
+                    'file_id': file_id,
+                    'fetch_time': fetch_time,
+                }
+                data = self._assemble_comprehensive(data, responses[file_id])
+                self._cache_comprehensive(data)
+                yield data
+    
+    def _comprehensive_requests(self, file_id):
+        """The (kind, request) lookups that make up comprehensive file data"""
+        return (
+            ('metadata', self._metadata_request(file_id, COMPREHENSIVE_METADATA_FIELDS)),
+            ('revisions', self._revisions_request(file_id)),
+            ('comments', self._comments_request(file_id)),
+            ('permissions', self._permissions_request(file_id)),
+        )
+    
+    def _assemble_comprehensive(self, data, responses, http=None):
+        """Fill data from the batched lookup responses, keyed by kind"""
+        file_id = data['file_id']
+        
+        # Metadata with EVERY field
+        metadata = responses.get('metadata')
         if metadata:
             data['metadata'] = metadata
             print(f"  File: {metadata.get('name', 'Unknown')}")
         
-        # Get revisions (ACTIVITY LOG)
-        revisions = self.get_file_revisions(file_id)
+        # Revisions (ACTIVITY LOG)
+        revisions_page = responses.get('revisions', {})
+        revisions = revisions_page.get('revisions', [])
+        if revisions_page.get('nextPageToken'):
+            revisions.extend(self.iter_revisions(
+                file_id, page_token=revisions_page['nextPageToken'], http=http
+            ))
+        print(f"  ✓ Found {len(revisions)} revisions")
         if revisions:
             data['revisions'] = revisions
             data['revision_count'] = len(revisions)
         
-        # Get comments WITH REPLIES
-        comments = self.get_file_comments(file_id)
+        # Comments WITH REPLIES
+        comments = responses.get('comments', {}).get('comments', [])
+        print(f"  ✓ Found {len(comments)} comments")
         if comments:
             data['comments'] = comments
             data['comment_count'] = len(comments)
         
-        # Get detailed permissions
-        permissions = self.get_file_permissions(file_id)
+        # Detailed permissions
+        permissions = responses.get('permissions', {}).get('permissions', [])
+        print(f"  ✓ Found {len(permissions)} permissions")
         if permissions:
             data['permissions'] = permissions
             data['permission_count'] = len(permissions)
         
-        # Get labels (if any)
-        labels = self.get_file_labels(file_id)
+        # Labels (if any) - labelInfo is already in the metadata response
+        labels = self.get_file_labels(file_id, metadata=metadata or {})
         if labels:
             data['labels'] = labels
         
         print(f"✓ MAXIMUM comprehensive data collected")
         return data
     
+    def bulk_comprehensive(self, file_ids, concurrency=10, on_result=None):
+        """
+        Get comprehensive data for many files concurrently
+        
+        At most `concurrency` files are in flight at once, each on its own
+        connection. Results are returned in the same order as file_ids.
+        
+        With a cache, current versions are probed in batches first and
+        files whose version is unchanged are served from the cache. Note
+        that Drive does not bump `version` when a file is only viewed, so
+        cached records can carry a stale viewedByMeTime.
+        
+        on_result: Optional callback(done_count, data), called from this
+                   thread as each file completes (e.g. for progress)
+        """
+        if not self.service:
+            print("Not authenticated. Run authenticate() first.")
+            return []
+        
+        self._ensure_fresh()
+        
+        results = [None] * len(file_ids)
+        done = 0
+        
+        to_fetch = list(range(len(file_ids)))
+        if self.cache is not None:
+            versions = self.get_file_versions(file_ids)
+            to_fetch = []
+            for index, file_id in enumerate(file_ids):
+                cached = self.cache.get(file_id, versions.get(file_id), COMPREHENSIVE_CACHE_KEY)
+                if cached is None:
+                    to_fetch.append(index)
+                    continue
+                results[index] = cached
+                done += 1
+                if on_result is not None:
+                    on_result(done, cached)
+            print(f"✓ {done} unchanged files served from cache, fetching {len(to_fetch)}")
+        
+        def fetch(file_id):
+            data = self.get_comprehensive_file_data(file_id, http=self._new_http())
+            self._cache_comprehensive(data)
+            return data
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {
+                executor.submit(fetch, file_ids[index]): index
+                for index in to_fetch
+            }
+            for future in as_completed(futures):
+                data = future.result()
+                results[futures[future]] = data
+                done += 1
+                if on_result is not None:
+                    on_result(done, data)
+        return results
+    
+    def recapture_comprehensive(self, baseline_records, changed_ids=None, on_result=None):
+        """
+        Re-fetch comprehensive data for previously captured files, in order
+        
+        Files in changed_ids (every file, when it is None) are fetched in
+        full. For the rest Drive reported no change, so their revisions,
+        comments and permissions are carried over from the baseline record
+        and only the file metadata is fetched again, in batches. Metadata
+        is always re-read because viewedByMeTime can move without a change
+        record. Files whose metadata lookup fails are fetched in full
+        instead, so no record is ever returned without its metadata.
+        
+        on_result: Optional callback(done_count, data), as for bulk_comprehensive
+        """
+        file_ids = [record.get('file_id') for record in baseline_records]
+        if changed_ids is None:
+            return self.bulk_comprehensive(file_ids, on_result=on_result)
+        
+        results = [None] * len(file_ids)
+        full = [i for i, file_id in enumerate(file_ids) if file_id in changed_ids]
+        light = [i for i, file_id in enumerate(file_ids) if file_id not in changed_ids]
+        print(f"✓ {len(full)} files changed since baseline, "
+              f"{len(light)} unchanged (metadata only)")
+        
+        metadata = self.get_file_metadata_batch(
+            [file_ids[i] for i in light],
+            fields=COMPREHENSIVE_METADATA_FIELDS
+        )
+        missing = [i for i in light if not metadata.get(file_ids[i])]
+        if missing:
+            # The full fetch raises if Drive keeps failing these lookups
+            print(f"⚠️ No metadata for {len(missing)} unchanged file(s), fetching them in full")
+            light = [i for i in light if metadata.get(file_ids[i])]
+            full = sorted(full + missing)
+        fetch_time = datetime.now().isoformat()
+        
+        done = 0
+        for i in light:
+            data = {
+                key: value for key, value in baseline_records[i].items()
+                if key not in ('metadata', 'labels')
+            }
+            data['fetch_time'] = fetch_time
+            file_metadata = metadata[file_ids[i]]
+            data['metadata'] = file_metadata
+            labels = self.get_file_labels(file_ids[i], metadata=file_metadata)
+            if labels:
+                data['labels'] = labels
+            results[i] = data
+            done += 1
+            if on_result is not None:
+                on_result(done, data)
+        
+        def on_fetched(count, data):
+            if on_result is not None:
+                on_result(done + count, data)
+        
+        fetched = self.bulk_comprehensive([file_ids[i] for i in full], on_result=on_fetched)
+        for i, data in zip(full, fetched):
+            results[i] = data
+        return results
+    
+    def get_file_versions(self, file_ids):
+        """
+        Get the current Drive `version` of many files using batched requests
+        
+        Returns:
+            dict: file_id -> version for every file that could be fetched
+        """
+        versions = {}
+        
+        def callback(request_id, response, exception):
+            if exception is None:
+                versions[request_id] = response.get('version')
+        
+        file_ids = list(dict.fromkeys(file_ids))
+        for start in range(0, len(file_ids), BATCH_LIMIT):
+            try:
+                self._execute_batch(
+                    (
+                        (file_id, self._metadata_request(file_id, 'id, version'))
+                        for file_id in file_ids[start:start + BATCH_LIMIT]
+                    ),
+                    callback
+                )
+            except API_ERRORS as error:
+                print(f"  ⚠️ Could not fetch versions: {error}")
+        return versions
+    
+    def _cache_comprehensive(self, data):
+        """Store a comprehensive record in the cache, keyed by its version"""
+        if self.cache is not None and 'metadata' in data:
+            self.cache.put(
+                data['file_id'],
+                data['metadata'].get('version'),
+                data,
+                COMPREHENSIVE_CACHE_KEY
+            )
+    
+    def _execute_with_backoff(self, request, http=None):
+        """
+        Execute a request or batch, retrying rate-limit, server and
+        connection errors
+        
+        Waits for the server's Retry-After delay when one is given, else
+        for an exponentially growing delay with jitter.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return request.execute(http=http)
+            except API_ERRORS as error:
+                if not _is_retryable(error) or attempt == MAX_RETRIES:
+                    raise
+                delay = _retry_delay(error, attempt)
+                reason = f"HTTP {error.resp.status}" if isinstance(error, HttpError) else error
+                print(f"  ⏳ {reason}, retrying in {delay:.1f}s...")
+                time.sleep(delay)
+    
+    def _execute_batch(self, requests, callback, http=None):
+        """
+        Execute (request_id, request) pairs as one batch, retrying throttled calls
+        
+        Drive answers each call in a batch separately, so a batch can succeed
+        while some of its calls were rate limited or hit a server error.
+        Those calls are sent again in a new batch, after the same Retry-After
+        or jittered exponential delay as whole requests. Every other result
+        goes to callback(request_id, response, exception).
+        
+        Raises:
+            HttpError: A call was still throttled after MAX_RETRIES retries
+        """
+        pending = dict(requests)
+        for attempt in range(MAX_RETRIES + 1):
+            throttled = {}
+            
+            def collect(request_id, response, exception):
+                if isinstance(exception, HttpError) and _is_retryable(exception):
+                    throttled[request_id] = exception
+                else:
+                    callback(request_id, response, exception)
+            
+            batch = self.service.new_batch_http_request(callback=collect)
+            for request_id, request in pending.items():
+                batch.add(request, request_id=request_id)
+            self._execute_with_backoff(batch, http=http)
+            
+            if not throttled:
+                return
+            if attempt == MAX_RETRIES:
+                raise next(iter(throttled.values()))
+            
+            delay = max(_retry_delay(error, attempt) for error in throttled.values())
+            print(f"  ⏳ {len(throttled)} call(s) in batch throttled, retrying in {delay:.1f}s...")
+            time.sleep(delay)
+            pending = {request_id: pending[request_id] for request_id in throttled}
+    
     def get_file_permissions(self, file_id):
         """Get detailed permissions (who has access and what they can do)"""
         if not self.service:
@@ -350,25 +1166,36 @@ class DriveForensicTool:
         try:
             print(f"  Fetching detailed permissions...")
             
-            # Request ALL permission fields
-            permissions = self.service.permissions().list(
-                fileId=file_id,
-                fields='*',
-                pageSize=100,
-                supportsAllDrives=True
-            ).execute()
+            permissions = self._permissions_request(file_id).execute()
             
             permission_list = permissions.get('permissions', [])
             print(f"  ✓ Found {len(permission_list)} permissions")
             
             return permission_list
             
-        except HttpError as error:
+        except API_ERRORS as error:
             print(f"  ⚠️ Could not fetch permissions: {error}")
             return []
     
-    def get_file_labels(self, file_id):
-        """Get labels applied to file"""
+    def _permissions_request(self, file_id):
+        """Build (without executing) a permissions.list request"""
+        return self.service.permissions().list(
+            fileId=file_id,
+            fields=PERMISSION_FIELDS,
+            pageSize=100,
+            supportsAllDrives=True
+        )
+    
+    def get_file_labels(self, file_id, metadata=None):
+        """
+        Get labels applied to file
+        
+        metadata: An already-fetched files.get response that includes
+                  labelInfo; when given, no extra API call is made
+        """
+        if metadata is not None:
+            return self._extract_labels(metadata)
+        
         if not self.service:
             print("Not authenticated. Run authenticate() first.")
             return {}
@@ -376,53 +1203,215 @@ class DriveForensicTool:
         try:
             print(f"  Fetching labels...")
             
-            # Labels are part of metadata, but let's be explicit
-            file_info = self.service.files().get(
-                fileId=file_id,
-                fields='labelInfo,labels',
-                supportsAllDrives=True
-            ).execute()
-            
-            label_info = file_info.get('labelInfo', {})
-            labels = file_info.get('labels', {})
+            file_info = self._labels_request(file_id).execute()
+            return self._extract_labels(file_info)
             
-            if label_info or labels:
-                print(f"  ✓ Found label information")
-                return {'labelInfo': label_info, 'labels': labels}
-            
-            return {}
-            
-        except HttpError as error:
+        except API_ERRORS as error:
             print(f"  ⚠️ Could not fetch labels: {error}")
             return {}
     
-    def find_files_by_date_range(self, start_date, end_date, date_field='modifiedTime'):
+    def _labels_request(self, file_id):
+        """Build (without executing) a files.get request for label fields"""
+        return self.service.files().get(
+            fileId=file_id,
+            fields='labelInfo',
+            supportsAllDrives=True
+        )
+    
+    def _extract_labels(self, file_info):
+        """Pull label information out of a files.get response"""
+        label_info = file_info.get('labelInfo', {})
+        
+        if label_info:
+            print(f"  ✓ Found label information")
+            return {'labelInfo': label_info}
+        
+        return {}
+    
+    def find_files_by_date_range(self, start_date, end_date, date_field='modifiedTime',
+                                 include_trashed=True, include_folders=True):
         """
         Find files modified/created within a date range
         date_field: 'modifiedTime', 'createdTime', or 'viewedByMeTime'
+        
+        include_trashed / include_folders: When False, trashed files or
+        folders are excluded by the server query rather than transferred
         """
         query = f"{date_field} >= '{start_date}' and {date_field} <= '{end_date}'"
+        if not include_trashed:
+            query += " and trashed = false"
+        if not include_folders:
+            query += f" and mimeType != '{FOLDER_MIME_TYPE}'"
         print(f"Searching with query: {query}")
         return self.list_files(query=query, max_results=1000)
     
+    def incremental_scan(self, token_file='changes_token.json', fields=None):
+        """
+        Return only the files changed since the previous incremental scan
+        
+        The first call records a Changes API start token and returns an
+        empty list; each later call returns the change records since the
+        saved token and advances it. Each record has fileId, removed, time
+        and (unless removed) file with the requested fields.
+        
+        With a metadata cache enabled, changed files are written through
+        to it so follow-up get_file_metadata() calls can be served locally.
+        """
+        if not self.service:
+            print("Not authenticated. Run authenticate() first.")
+            return []
+        
+        self._ensure_fresh()
+        
+        fields = fields or SUMMARY_FIELDS
+        changes_api = self.service.changes()
+        
+        try:
+            if not os.path.exists(token_file):
+                start = changes_api.getStartPageToken(supportsAllDrives=True).execute()
+                self._save_changes_token(token_file, start['startPageToken'])
+                print(f"✓ Recorded change baseline in {token_file}")
+                print("  Run the scan again to list files changed since now")
+                return []
+            
+            page_token = read_json(token_file)['startPageToken']
+            
+            print(f"Fetching changes since last scan...")
+            
+            changes, new_start = self._list_changes(
+                page_token,
+                f"fileId, removed, time, file(version, {fields})"
+            )
+            
+        except API_ERRORS as error:
+            print(f"An error occurred: {error}")
+            return []
+        
+        if self.cache is not None:
+            for change in changes:
+                file = change.get('file')
+                if file and not change.get('removed'):
+                    self.cache.put(change['fileId'], file.get('version'), file, fields)
+        
+        # Only advance once every page has been read, so a failed scan is retried
+        self._save_changes_token(token_file, new_start)
+        
+        removed = sum(1 for change in changes if change.get('removed'))
+        print(f"✓ {len(changes) - removed} changed, {removed} removed since last scan")
+        return changes
+    
+    def get_start_page_token(self):
+        """
+        Current position in the Changes API, for changed_file_ids() later
+        
+        Returns None if the token could not be fetched.
+        """
+        if not self.service:
+            print("Not authenticated. Run authenticate() first.")
+            return None
+        
+        try:
+            start = self.service.changes().getStartPageToken(supportsAllDrives=True).execute()
+            return start['startPageToken']
+        except API_ERRORS as error:
+            print(f"  ⚠️ Could not fetch changes start token: {error}")
+            return None
+    
+    def changed_file_ids(self, page_token):
+        """
+        IDs of every file changed or removed since page_token
+        
+        Returns None if the changes could not be listed, so callers can
+        fall back to treating every file as changed.
+        """
+        if not self.service or not page_token:
+            return None
+        
+        self._ensure_fresh()
+        
+        try:
+            changes, _ = self._list_changes(page_token, "fileId")
+        except API_ERRORS as error:
+            print(f"  ⚠️ Could not list changes: {error}")
+            return None
+        
+        return {change['fileId'] for change in changes}
+    
+    def _list_changes(self, page_token, change_fields):
+        """
+        Read every change record since page_token
+        
+        Returns:
+            (changes, newStartPageToken)
+        """
+        changes_api = self.service.changes()
+        changes = []
+        new_start = page_token
+        while page_token:
+            response = changes_api.list(
+                pageToken=page_token,
+                pageSize=1000,
+                fields=f"nextPageToken, newStartPageToken, changes({change_fields})",
+                includeRemoved=True,
+                includeItemsFromAllDrives=True,
+                supportsAllDrives=True
+            ).execute()
+            changes.extend(response.get('changes', []))
+            page_token = response.get('nextPageToken')
+            new_start = response.get('newStartPageToken')
+        return changes, new_start
+    
+    def _save_changes_token(self, token_file, page_token):
+        """Persist the Changes API start token for the next incremental scan"""
+        write_json(token_file, {
+            'startPageToken': page_token,
+            'saved': datetime.now().isoformat()
+        })
+    
     def export_metadata_report(self, files, output_file='forensic_report.json'):
-        """Export file metadata to JSON for documentation"""
-        report = {
-            'timestamp': datetime.now().isoformat(),
-            'tool': 'Drive Forensic Tool (Read-Only)',
-            'file_count': len(files),
-            'files': files
-        }
+        """
+        Export file metadata to JSON for documentation
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, default=str)
+        files may be any iterable (e.g. iter_files()); records are written
+        one at a time so memory stays flat. An output_file ending in
+        .ndjson is written as one JSON object per line instead.
+        """
+        file_count = 0
+        
+        with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            if output_file.endswith('.ndjson'):
+                for file in files:
+                    f.write(dumps(file) + b'\n')
+                    file_count += 1
+            else:
+                f.write(b'{\n  "timestamp": ' + dumps(datetime.now().isoformat()))
+                f.write(b',\n  "tool": ' + dumps('Drive Forensic Tool (Read-Only)'))
+                f.write(b',\n  "files": [')
+                for file in files:
+                    f.write((b',\n    ' if file_count else b'\n    ') + dumps(file))
+                    file_count += 1
+                f.write(b'\n  ],\n  "file_count": ' + dumps(file_count) + b'\n}\n')
         
-        print(f"✓ Exported metadata report to {output_file}")
+        print(f"✓ Exported metadata report for {file_count} files to {output_file}")
         return output_file
     
-    def test_read_only_restriction(self):
-        """Test that we cannot modify files (should fail)"""
+    def test_read_only_restriction(self, deep=False):
+        """
+        Test that we cannot modify files
+        
+        By default the scopes granted to the credentials are checked locally.
+        With deep=True (or if the scopes are unknown or broader than
+        read-only) a file creation is attempted, which should fail.
+        """
         print("\n=== Testing Read-Only Restriction ===")
+        
+        if not deep:
+            granted = (getattr(self.creds, 'granted_scopes', None)
+                       or getattr(self.creds, 'scopes', None) or [])
+            if granted and set(granted) <= set(SCOPES):
+                print("✓ GOOD: Credentials only grant read-only scope")
+                return True
+        
         print("Attempting to create a file (this should FAIL)...")
         
         try:
@@ -430,7 +1419,7 @@ class DriveForensicTool:
             self.service.files().create(body=file_metadata).execute()
             print("❌ WARNING: File creation succeeded! Scope may not be read-only!")
             return False
-        except HttpError as error:
+        except API_ERRORS as error:
             if 'insufficient authentication scopes' in str(error).lower():
                 print("✓ GOOD: Cannot create files (read-only confirmed)")
                 return True
@@ -457,7 +1446,7 @@ def main():
     
     # List recent files
     print("\n[2] Listing recent files...")
-    files = tool.list_files(max_results=10)
+    files = tool.list_files(max_results=10, fields=FORENSIC_FIELDS)
     
     if not files:
         print("No files found or no access to any files.")
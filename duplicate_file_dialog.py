@@ -4,10 +4,31 @@ Duplicate File Selection Dialog
 Shows when multiple files match and lets user pick the right one
 """
 
+import tkinter as tk
 import customtkinter as ctk
 from typing import List, Tuple, Optional, Callable
 
 
+# Fixed dialog size
+DIALOG_WIDTH = 700
+DIALOG_HEIGHT = 500
+
+# Height of one match row in the list, including the gap below it
+ROW_HEIGHT = 84
+ROW_GAP = 10
+
+# Retry the modal grab this often until the window manager shows the dialog
+GRAB_RETRY_MS = 10
+GRAB_RETRIES = 200
+
+
+def _resolve_color(color):
+    """Pick the variant of a (light, dark) CTk color for the current appearance mode"""
+    if isinstance(color, (list, tuple)):
+        return color[1] if ctk.get_appearance_mode() == "Dark" else color[0]
+    return color
+
+
 class DuplicateFileDialog(ctk.CTkToplevel):
     """
     Dialog for selecting from multiple matching files
@@ -30,19 +51,12 @@ class DuplicateFileDialog(ctk.CTkToplevel):
         self.selected_index = None
         
         self.title("Multiple Files Found")
-        self.geometry("700x500")
-        
-        # Center on screen
-        self.update_idletasks()
-        x = (self.winfo_screenwidth() // 2) - 350
-        y = (self.winfo_screenheight() // 2) - 250
-        self.geometry(f"700x500+{x}+{y}")
-        
-        # Make modal
-        self.transient(parent)
-        self.grab_set()
+        self.geometry(f"{DIALOG_WIDTH}x{DIALOG_HEIGHT}")
         
         self.setup_ui()
+        
+        # Position and grab once the widgets exist, in a single layout pass
+        self.after_idle(self._finalize_geometry, parent)
     
     def setup_ui(self):
         """Setup the dialog UI"""
@@ -70,87 +84,34 @@ class DuplicateFileDialog(ctk.CTkToplevel):
             font=ctk.CTkFont(size=12)
         ).pack(anchor="w", pady=(5, 0))
         
-        # Scrollable list
-        list_frame = ctk.CTkScrollableFrame(self)
+        # Virtualized list: only the rows that fit on screen are created,
+        # and they are rebound to different matches as the user scrolls
+        list_frame = ctk.CTkFrame(self)
         list_frame.pack(fill="both", expand=True, padx=20, pady=(0, 10))
         
+        self.canvas = tk.Canvas(
+            list_frame,
+            highlightthickness=0,
+            bd=0,
+            bg=_resolve_color(list_frame.cget("fg_color")),
+            yscrollincrement=ROW_HEIGHT
+        )
+        self.scrollbar = ctk.CTkScrollbar(list_frame, command=self.canvas.yview)
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 5), pady=5)
+        self.canvas.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
+        
+        self.canvas.configure(
+            yscrollcommand=self._on_canvas_scrolled,
+            scrollregion=(0, 0, 0, len(self.matches) * ROW_HEIGHT)
+        )
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        self._bind_mousewheel(self.canvas)
+        
         # Radio button variable
         self.selection_var = ctk.IntVar(value=0)
         
-        # Create radio buttons for each match
-        for i, (filename, score) in enumerate(self.matches):
-            file_meta = self.metadata[i] if i < len(self.metadata) else {}
-            
-            # Container for this file
-            file_container = ctk.CTkFrame(list_frame, fg_color="gray25", corner_radius=8)
-            file_container.pack(fill="x", pady=5)
-            
-            # Radio button with file info
-            radio_container = ctk.CTkFrame(file_container, fg_color="transparent")
-            radio_container.pack(fill="x", padx=10, pady=10)
-            
-            # Radio button
-            radio = ctk.CTkRadioButton(
-                radio_container,
-                text="",
-                variable=self.selection_var,
-                value=i,
-                font=ctk.CTkFont(size=12)
-            )
-            radio.pack(side="left", padx=(0, 10))
-            
-            # File info
-            info_container = ctk.CTkFrame(radio_container, fg_color="transparent")
-            info_container.pack(side="left", fill="x", expand=True)
-            
-            # Filename
-            ctk.CTkLabel(
-                info_container,
-                text=f"{filename}",
-                font=ctk.CTkFont(size=13, weight="bold"),
-                anchor="w"
-            ).pack(anchor="w")
-            
-            # Similarity score
-            ctk.CTkLabel(
-                info_container,
-                text=f"Similarity: {score:.1%}",
-                font=ctk.CTkFont(size=11),
-                text_color="lightblue",
-                anchor="w"
-            ).pack(anchor="w")
-            
-            # Additional metadata
-            meta_parts = []
-            
-            if 'modifiedTime' in file_meta:
-                modified = file_meta['modifiedTime']
-                if 'T' in modified:
-                    modified = modified.split('T')[0]  # Just date
-                meta_parts.append(f"Modified: {modified}")
-            
-            if 'size' in file_meta:
-                size = int(file_meta.get('size', 0))
-                if size > 1024*1024:
-                    size_str = f"{size/(1024*1024):.1f} MB"
-                elif size > 1024:
-                    size_str = f"{size/1024:.1f} KB"
-                else:
-                    size_str = f"{size} B"
-                meta_parts.append(f"Size: {size_str}")
-            
-            if 'location' in file_meta and file_meta['location']:
-                meta_parts.append(f"Location: {file_meta['location']}")
-            
-            if meta_parts:
-                meta_text = " • ".join(meta_parts)
-                ctk.CTkLabel(
-                    info_container,
-                    text=meta_text,
-                    font=ctk.CTkFont(size=10),
-                    text_color="gray",
-                    anchor="w"
-                ).pack(anchor="w")
+        # Pool of reusable row widgets
+        self._rows = []
         
         # Help text
         help_frame = ctk.CTkFrame(self, fg_color="gray20")
@@ -185,6 +146,187 @@ class DuplicateFileDialog(ctk.CTkToplevel):
             width=100
         ).pack(side="right")
     
+    def _finalize_geometry(self, parent):
+        """Center the dialog on screen and make it modal"""
+        x = (self.winfo_screenwidth() - DIALOG_WIDTH) // 2
+        y = (self.winfo_screenheight() - DIALOG_HEIGHT) // 2
+        self.geometry(f"{DIALOG_WIDTH}x{DIALOG_HEIGHT}+{x}+{y}")
+        
+        # Make modal
+        self.transient(parent)
+        self._grab_when_viewable(GRAB_RETRIES)
+    
+    def _grab_when_viewable(self, retries):
+        """Make the dialog modal once it is viewable; a grab needs a mapped window"""
+        if not self.winfo_exists():
+            return
+        if self.winfo_viewable():
+            try:
+                self.grab_set()
+                return
+            except tk.TclError:
+                # Another window still holds the grab
+                pass
+        if retries > 0:
+            self.after(GRAB_RETRY_MS, self._grab_when_viewable, retries - 1)
+    
+    def _create_row(self):
+        """Create one reusable row widget and place it on the canvas"""
+        # Container for this file
+        file_container = ctk.CTkFrame(self.canvas, fg_color="gray25", corner_radius=8)
+        
+        # Radio button with file info
+        radio_container = ctk.CTkFrame(file_container, fg_color="transparent")
+        radio_container.pack(fill="x", padx=10, pady=10)
+        
+        # Radio button
+        radio = ctk.CTkRadioButton(
+            radio_container,
+            text="",
+            variable=self.selection_var,
+            value=0,
+            font=ctk.CTkFont(size=12)
+        )
+        radio.pack(side="left", padx=(0, 10))
+        
+        # File info
+        info_container = ctk.CTkFrame(radio_container, fg_color="transparent")
+        info_container.pack(side="left", fill="x", expand=True)
+        
+        # Filename
+        name_label = ctk.CTkLabel(
+            info_container,
+            text="",
+            font=ctk.CTkFont(size=13, weight="bold"),
+            anchor="w"
+        )
+        name_label.pack(anchor="w")
+        
+        # Similarity score
+        score_label = ctk.CTkLabel(
+            info_container,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color="lightblue",
+            anchor="w"
+        )
+        score_label.pack(anchor="w")
+        
+        # Additional metadata
+        meta_label = ctk.CTkLabel(
+            info_container,
+            text="",
+            font=ctk.CTkFont(size=10),
+            text_color="gray",
+            anchor="w"
+        )
+        meta_label.pack(anchor="w")
+        
+        window = self.canvas.create_window(
+            0, 0,
+            anchor="nw",
+            window=file_container,
+            width=self.canvas.winfo_width(),
+            height=ROW_HEIGHT - ROW_GAP
+        )
+        self._bind_mousewheel(file_container)
+        
+        return {
+            'window': window,
+            'radio': radio,
+            'name': name_label,
+            'score': score_label,
+            'meta': meta_label,
+            'index': None
+        }
+    
+    def _bind_row(self, row, index):
+        """Show match `index` in a pooled row"""
+        filename, score = self.matches[index]
+        file_meta = self.metadata[index] if index < len(self.metadata) else {}
+        
+        row['index'] = index
+        row['name'].configure(text=f"{filename}")
+        row['score'].configure(text=f"Similarity: {score:.1%}")
+        row['meta'].configure(text=self._format_meta(file_meta))
+        row['radio'].configure(value=index)
+        
+        # Redraw the radio state without touching the shared variable
+        if self.selection_var.get() == index:
+            row['radio'].select(from_variable_callback=True)
+        else:
+            row['radio'].deselect(from_variable_callback=True)
+    
+    def _format_meta(self, file_meta):
+        """Build the modified/size/location line for a match"""
+        meta_parts = []
+        
+        if 'modifiedTime' in file_meta:
+            modified = file_meta['modifiedTime']
+            if 'T' in modified:
+                modified = modified.split('T')[0]  # Just date
+            meta_parts.append(f"Modified: {modified}")
+        
+        if 'size' in file_meta:
+            size = int(file_meta.get('size', 0))
+            if size > 1024*1024:
+                size_str = f"{size/(1024*1024):.1f} MB"
+            elif size > 1024:
+                size_str = f"{size/1024:.1f} KB"
+            else:
+                size_str = f"{size} B"
+            meta_parts.append(f"Size: {size_str}")
+        
+        if 'location' in file_meta and file_meta['location']:
+            meta_parts.append(f"Location: {file_meta['location']}")
+        
+        return " • ".join(meta_parts)
+    
+    def _refresh_rows(self):
+        """Position pooled rows over the visible part of the list"""
+        visible_rows = self.canvas.winfo_height() // ROW_HEIGHT + 2
+        while len(self._rows) < min(len(self.matches), visible_rows):
+            self._rows.append(self._create_row())
+        
+        first = int(self.canvas.canvasy(0)) // ROW_HEIGHT
+        for slot, row in enumerate(self._rows):
+            index = first + slot
+            if index >= len(self.matches):
+                self.canvas.itemconfigure(row['window'], state="hidden")
+                row['index'] = None
+                continue
+            
+            self.canvas.itemconfigure(row['window'], state="normal")
+            self.canvas.coords(row['window'], 0, index * ROW_HEIGHT)
+            if row['index'] != index:
+                self._bind_row(row, index)
+    
+    def _on_canvas_configure(self, event):
+        """Keep rows as wide as the canvas and fill newly exposed space"""
+        for row in self._rows:
+            self.canvas.itemconfigure(row['window'], width=event.width)
+        self._refresh_rows()
+    
+    def _on_canvas_scrolled(self, first, last):
+        """Canvas view moved: sync the scrollbar and rebind rows"""
+        self.scrollbar.set(first, last)
+        self._refresh_rows()
+    
+    def _bind_mousewheel(self, widget):
+        """Scroll the list when the wheel is used over widget or its children"""
+        widget.bind("<MouseWheel>", self._on_mousewheel, add="+")
+        widget.bind("<Button-4>", self._on_mousewheel, add="+")
+        widget.bind("<Button-5>", self._on_mousewheel, add="+")
+        for child in widget.winfo_children():
+            self._bind_mousewheel(child)
+    
+    def _on_mousewheel(self, event):
+        """Scroll one row per wheel notch"""
+        if event.num == 4 or event.delta > 0:
+            self.canvas.yview_scroll(-1, "units")
+        else:
+            self.canvas.yview_scroll(1, "units")
+    
     def on_select(self):
         """User clicked Select"""
         self.selected_index = self.selection_var.get()
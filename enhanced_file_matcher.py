@@ -3,16 +3,112 @@
 Enhanced File Matcher with Duplicate Detection and Handling
 """
 
-from difflib import SequenceMatcher
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+import os
+from operator import itemgetter
+import sys
 from typing import List, Tuple, Optional, Dict, Any
 import re
 
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = None
+    process = None
+
+# Normalized names kept before the cache is reset
+CANDIDATE_CACHE_SIZE = 50000
+
+# Candidate lists at least this long are scored on several threads
+PARALLEL_MIN_CANDIDATES = 20000
+
+
+@dataclass(slots=True)
+class MatchResult:
+    """
+    Result of EnhancedFileMatcher.find_matches_with_duplicates()
+    
+    Fields are read as attributes; result.matches style access still
+    works for callers written against the old dict result.
+    """
+    matches: List[Tuple[str, float]]
+    has_duplicates: bool
+    duplicate_groups: List[List[Tuple[str, float]]]
+    search_term: str
+    clean_search: str
+    requested_index: Optional[int]
+    total_matches: int
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
+def _lcs_length(a: str, b: str) -> int:
+    """
+    Length of the longest common subsequence of a and b
+    
+    Bit-parallel (Allison-Dix / Hyyro): each bit of `row` is one position
+    of b, so a whole DP row is updated with a few integer operations per
+    character of a. Python ints grow as needed, so any length works.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return 0
+    
+    positions = {}
+    for i, ch in enumerate(b):
+        positions[ch] = positions.get(ch, 0) | (1 << i)
+    
+    mask = (1 << len(b)) - 1
+    row = mask
+    for ch in a:
+        matches = row & positions.get(ch, 0)
+        row = ((row + matches) | (row - matches)) & mask
+    
+    # Each zero bit left in the row is one matched character
+    return len(b) - bin(row).count('1')
+
+
+def _ratio(a: str, b: str, score_cutoff: Optional[float] = None) -> float:
+    """
+    Fuzzy similarity in 0..1: 2 * LCS / (len(a) + len(b))
+    
+    This is the normalized Indel similarity that rapidfuzz.fuzz.ratio
+    computes, so scores are the same with or without rapidfuzz installed.
+    With score_cutoff, any result below it may be returned as 0.0, which
+    lets hopeless pairs be rejected without running the full comparison.
+    """
+    if fuzz is not None:
+        if score_cutoff is None:
+            return fuzz.ratio(a, b) / 100
+        # rapidfuzz rounds the cutoff to an edit distance; allow a point of slack
+        return fuzz.ratio(a, b, score_cutoff=max(0.0, score_cutoff * 100 - 1)) / 100
+    
+    total = len(a) + len(b)
+    if not total:
+        return 1.0
+    
+    # The shorter string bounds the LCS, so check that before the full pass
+    if score_cutoff is not None and 2 * min(len(a), len(b)) / total < score_cutoff:
+        return 0.0
+    return 2 * _lcs_length(a, b) / total
+
 
 class EnhancedFileMatcher:
     """
     Smart file matching with duplicate detection and handling
     """
     
+    # Trailing index notation: [2], #2 or (2)
+    _INDEX_RE = re.compile(r'\s*(?:\[(\d+)\]|#(\d+)|\((\d+)\))\s*$')
+    
     def __init__(self, similarity_threshold=0.6, duplicate_threshold=0.95):
         """
         Args:
@@ -21,31 +117,134 @@ class EnhancedFileMatcher:
         """
         self.similarity_threshold = similarity_threshold
         self.duplicate_threshold = duplicate_threshold
+        
+        # candidate -> (lowercased/stripped name, its word set); the same Drive
+        # listing is usually searched many times in one session
+        self._candidate_cache: Dict[str, Tuple[str, frozenset]] = {}
     
     def calculate_similarity(self, search_term: str, candidate: str) -> float:
         """Calculate similarity between search term and candidate"""
-        search_lower = search_term.lower().strip()
-        candidate_lower = candidate.lower().strip()
+        return self._make_scorer(search_term)(*self._prepare(candidate))
+    
+    def _prepare(self, name: str) -> Tuple[str, frozenset]:
+        """Normalized form of a name and its word set, cached per name"""
+        prepared = self._candidate_cache.get(name)
+        if prepared is None:
+            if len(self._candidate_cache) >= CANDIDATE_CACHE_SIZE:
+                self._candidate_cache.clear()
+            # Interned, so repeated names share one normalized string and the
+            # exact-match check against them is an identity compare; interned
+            # words are likewise shared across every cached name that uses them
+            lower = sys.intern(name.lower().strip())
+            prepared = (lower, frozenset(map(sys.intern, lower.split())))
+            self._candidate_cache[name] = prepared
+        return prepared
+    
+    def _make_scorer(self, search_term: str, cutoff: Optional[float] = None):
+        """
+        Build a scorer specialized to one search term
+        
+        Everything that depends only on the search term is computed here
+        once; the returned score(candidate_lower, candidate_words,
+        base_similarity=None) does only per-candidate work.
         
-        # Exact match
-        if search_lower == candidate_lower:
-            return 1.0
+        base_similarity: Fuzzy ratio if already computed in a batch
+        cutoff: Scores below this are only known to be below it, which
+                lets the fuzzy comparison bail out early
+        """
+        search_lower, search_words = self._prepare(search_term)
+        search_len = len(search_lower)
+        word_count = max(len(search_words), 1)
+        
+        # Word overlap adds at most 0.3, so above that a zero fuzzy ratio
+        # can never reach the cutoff
+        overlap_cannot_pass = cutoff is not None and cutoff > 0.3
+        
+        def score(candidate_lower: str, candidate_words: frozenset,
+                  base_similarity: Optional[float] = None) -> float:
+            # Exact match
+            if search_lower == candidate_lower:
+                return 1.0
+            
+            # Substring match
+            if search_lower in candidate_lower:
+                coverage = search_len / len(candidate_lower)
+                return 0.85 + (0.15 * coverage)
+            
+            # Rejected by the batch ratio cutoff: no need to look further
+            if base_similarity == 0.0 and overlap_cannot_pass:
+                return 0.0
+            
+            # Word overlap
+            word_overlap = len(search_words & candidate_words) / word_count
+            
+            # Fuzzy match, skipped when even a perfect ratio could not reach cutoff
+            # (with a little slack so float rounding never drops a boundary match)
+            if base_similarity is None:
+                needed = None if cutoff is None else (cutoff - word_overlap * 0.3) / 0.7 - 1e-9
+                base_similarity = _ratio(search_lower, candidate_lower, needed)
+            
+            # Combined score
+            return (base_similarity * 0.7) + (word_overlap * 0.3)
+        
+        return score
+    
+    def _score_batch(self, search_term: str, lowered: List[str],
+                     wordsets: List[frozenset]) -> List[float]:
+        """
+        Score pre-normalized candidates against one search term
+        
+        lowered and wordsets are parallel lists from _prepare(). Scores
+        below similarity_threshold are only guaranteed to be below it.
+        """
+        score = self._make_scorer(search_term, self.similarity_threshold)
+        base_scores = self._batch_ratios(self._prepare(search_term)[0], lowered)
+        return list(map(score, lowered, wordsets, base_scores))
+    
+    def _batch_ratios(self, search_lower: str, lowered: List[str]) -> List[Optional[float]]:
+        """
+        Fuzzy ratio of every candidate in one rapidfuzz call
         
-        # Substring match
-        if search_lower in candidate_lower:
-            coverage = len(search_lower) / len(candidate_lower)
-            return 0.85 + (0.15 * coverage)
+        Candidates whose ratio is too low to reach similarity_threshold even
+        with full word overlap are skipped by the cutoff and get 0.0. Without
+        rapidfuzz every entry is None and the scorer computes it per candidate.
+        """
+        if process is None:
+            return [None] * len(lowered)
+        
+        # Combined score is 0.7 * ratio + 0.3 * overlap, with overlap <= 1.
+        # The batch path rounds the cutoff to an edit distance, so leave a
+        # point of slack; the threshold filter afterwards is exact anyway.
+        cutoff = max(0.0, (self.similarity_threshold - 0.3) / 0.7 * 100 - 1)
+        ratios = [0.0] * len(lowered)
         
-        # Fuzzy match
-        base_similarity = SequenceMatcher(None, search_lower, candidate_lower).ratio()
+        def extract(offset, chunk):
+            return offset, process.extract(
+                search_lower, chunk,
+                scorer=fuzz.ratio,
+                processor=None,
+                limit=None,
+                score_cutoff=cutoff
+            )
         
-        # Word overlap
-        search_words = set(search_lower.split())
-        candidate_words = set(candidate_lower.split())
-        word_overlap = len(search_words & candidate_words) / max(len(search_words), 1)
+        # rapidfuzz releases the GIL while scoring, so large lists split
+        # across threads scale with the number of cores
+        workers = os.cpu_count() or 1
+        if workers > 1 and len(lowered) >= PARALLEL_MIN_CANDIDATES:
+            size = -(-len(lowered) // workers)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    extract,
+                    range(0, len(lowered), size),
+                    (lowered[i:i + size] for i in range(0, len(lowered), size))
+                ))
+        else:
+            results = [extract(0, lowered)]
         
-        # Combined score
-        return (base_similarity * 0.7) + (word_overlap * 0.3)
+        for offset, extracted in results:
+            for _, score, index in extracted:
+                ratios[offset + index] = score / 100
+        return ratios
     
     def parse_indexed_search(self, search_term: str) -> Tuple[str, Optional[int]]:
         """
@@ -60,86 +259,82 @@ class EnhancedFileMatcher:
         Returns:
             (clean_search_term, index)
         """
-        # Match patterns: [2], #2, (2)
-        patterns = [
-            r'\s*\[(\d+)\]\s*$',  # [2]
-            r'\s*#(\d+)\s*$',      # #2
-            r'\s*\((\d+)\)\s*$'    # (2)
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, search_term)
-            if match:
-                index = int(match.group(1))
-                clean_term = re.sub(pattern, '', search_term).strip()
-                return (clean_term, index)
+        match = self._INDEX_RE.search(search_term)
+        if match:
+            index = int(next(group for group in match.groups() if group))
+            clean_term = search_term[:match.start()].strip()
+            return (clean_term, index)
         
         return (search_term, None)
     
     def find_matches_with_duplicates(self, search_term: str, candidates: List[str], 
-                                    max_results: int = 10) -> Dict[str, Any]:
+                                    max_results: int = 10) -> MatchResult:
         """
         Find matches and detect duplicates
         
         Returns:
-            dict with:
-                - 'matches': List of (candidate, score) tuples
-                - 'has_duplicates': bool
-                - 'duplicate_groups': List of lists of similar matches
-                - 'search_term': Original search term
-                - 'indexed_search': Parsed search term and index
+            MatchResult with:
+                - matches: List of (candidate, score) tuples
+                - has_duplicates: bool
+                - duplicate_groups: List of lists of similar matches
+                - search_term: Original search term
+                - clean_search, requested_index: Parsed search term and index
+                - total_matches: Number of matches before max_results
         """
         # Parse for index notation
         clean_search, requested_index = self.parse_indexed_search(search_term)
         
-        # Calculate scores
-        scored = [
-            (candidate, self.calculate_similarity(clean_search, candidate))
-            for candidate in candidates
+        # Normalize every candidate once into parallel arrays, then score them
+        prepared = list(map(self._prepare, candidates))
+        lowered = list(map(itemgetter(0), prepared))
+        wordsets = list(map(itemgetter(1), prepared))
+        scores = self._score_batch(clean_search, lowered, wordsets)
+        
+        # Filter by threshold; tuples are only built for the survivors
+        threshold = self.similarity_threshold
+        matches = [
+            (candidate, candidate_score)
+            for candidate, candidate_score in zip(candidates, scores)
+            if candidate_score >= threshold
         ]
         
-        # Filter by threshold
-        matches = [(c, s) for c, s in scored if s >= self.similarity_threshold]
+        # Sort by score. Every match is sorted, not just the top max_results:
+        # duplicate groups are reported across the whole ranked list.
+        matches.sort(key=itemgetter(1), reverse=True)
         
-        # Sort by score
-        matches.sort(key=lambda x: x[1], reverse=True)
+        # Detect duplicates (files with very similar scores). Scores are read
+        # once into a flat array; groups are found as index ranges between
+        # score gaps and only sliced out of matches at the end.
+        tolerance = 1.0 - self.duplicate_threshold
+        scores = array('d', map(itemgetter(1), matches))
         
-        # Detect duplicates (files with very similar scores)
-        duplicate_groups = []
-        has_duplicates = False
+        # If adjacent scores are very close, they're duplicates
+        edges = [0]
+        edges.extend(
+            i for i, (prev_score, curr_score) in enumerate(zip(scores, islice(scores, 1, None)), 1)
+            if not abs(prev_score - curr_score) < tolerance
+        )
+        edges.append(len(matches))
         
-        if len(matches) > 1:
-            current_group = [matches[0]]
-            
-            for i in range(1, len(matches)):
-                prev_score = matches[i-1][1]
-                curr_score = matches[i][1]
-                
-                # If scores are very close, they're duplicates
-                if abs(prev_score - curr_score) < (1.0 - self.duplicate_threshold):
-                    current_group.append(matches[i])
-                else:
-                    if len(current_group) > 1:
-                        duplicate_groups.append(current_group)
-                        has_duplicates = True
-                    current_group = [matches[i]]
-            
-            # Don't forget last group
-            if len(current_group) > 1:
-                duplicate_groups.append(current_group)
-                has_duplicates = True
-        
-        return {
-            'matches': matches[:max_results],
-            'has_duplicates': has_duplicates,
-            'duplicate_groups': duplicate_groups,
-            'search_term': search_term,
-            'clean_search': clean_search,
-            'requested_index': requested_index,
-            'total_matches': len(matches)
-        }
-    
-    def select_best_match(self, result: Dict[str, Any], 
+        duplicate_groups = [
+            matches[start:end]
+            for start, end in zip(edges, islice(edges, 1, None))
+            if end - start > 1
+        ]
+        
+        has_duplicates = bool(duplicate_groups)
+        
+        return MatchResult(
+            matches=matches[:max_results],
+            has_duplicates=has_duplicates,
+            duplicate_groups=duplicate_groups,
+            search_term=search_term,
+            clean_search=clean_search,
+            requested_index=requested_index,
+            total_matches=len(matches)
+        )
+    
+    def select_best_match(self, result: MatchResult, 
                          strategy: str = 'first',
                          metadata: Optional[List[Dict]] = None) -> Optional[Tuple[str, float, str]]:
         """
@@ -159,21 +354,21 @@ class EnhancedFileMatcher:
         Returns:
             (selected_file, score, reason) or None
         """
-        matches = result['matches']
+        matches = result.matches
         
         if not matches:
             return None
         
         # Strategy: Use requested index
-        if strategy == 'indexed' and result['requested_index'] is not None:
-            idx = result['requested_index'] - 1  # Convert to 0-based
+        if strategy == 'indexed' and result.requested_index is not None:
+            idx = result.requested_index - 1  # Convert to 0-based
             if 0 <= idx < len(matches):
                 file, score = matches[idx]
-                return (file, score, f"Selected by index #{result['requested_index']}")
+                return (file, score, f"Selected by index #{result.requested_index}")
             else:
                 # Index out of range, fall back to first
                 file, score = matches[0]
-                return (file, score, f"Index #{result['requested_index']} out of range, using first match")
+                return (file, score, f"Index #{result.requested_index} out of range, using first match")
         
         # Strategy: Ask user
         if strategy == 'ask':
@@ -183,58 +378,64 @@ class EnhancedFileMatcher:
         if strategy == 'first':
             file, score = matches[0]
             reason = "Highest similarity score"
-            if result['has_duplicates']:
+            if result.has_duplicates:
                 reason += " (duplicates detected - consider using index notation)"
             return (file, score, reason)
         
         # Metadata-based strategies
         if metadata and len(metadata) == len(matches):
+            # Single O(n) pass each; ties keep the higher-scoring (earlier) match
             if strategy == 'newest':
-                # Sort by modifiedTime (newest first)
-                combined = list(zip(matches, metadata))
-                combined.sort(key=lambda x: x[1].get('modifiedTime', ''), reverse=True)
-                file, score = combined[0][0]
+                best = max(range(len(matches)), key=lambda i: metadata[i].get('modifiedTime', ''))
+                file, score = matches[best]
                 return (file, score, "Selected by newest modified date")
             
             elif strategy == 'oldest':
-                combined = list(zip(matches, metadata))
-                combined.sort(key=lambda x: x[1].get('modifiedTime', ''))
-                file, score = combined[0][0]
+                best = min(range(len(matches)), key=lambda i: metadata[i].get('modifiedTime', ''))
+                file, score = matches[best]
                 return (file, score, "Selected by oldest modified date")
             
             elif strategy == 'largest':
-                combined = list(zip(matches, metadata))
-                combined.sort(key=lambda x: int(x[1].get('size', 0)), reverse=True)
-                file, score = combined[0][0]
+                best = max(range(len(matches)), key=lambda i: int(metadata[i].get('size', 0)))
+                file, score = matches[best]
                 return (file, score, "Selected by largest file size")
         
         # Default: first match
         file, score = matches[0]
         return (file, score, "First match (default)")
     
-    def format_duplicate_warning(self, result: Dict[str, Any]) -> str:
+    def format_duplicate_warning(self, result: MatchResult) -> str:
         """
         Generate a warning message for duplicates
         
         Returns:
             str: Formatted warning message
         """
-        if not result['has_duplicates']:
+        if not result.has_duplicates:
             return ""
         
-        warning = f"\n⚠️  DUPLICATE FILES DETECTED!\n"
-        warning += f"   Search: '{result['search_term']}'\n"
-        warning += f"   Found {result['total_matches']} similar files:\n\n"
-        
-        for i, (file, score) in enumerate(result['matches'], 1):
-            warning += f"   {i}. {file} ({score:.1%})\n"
-        
-        warning += f"\n   💡 To select a specific file, use index notation:\n"
-        warning += f"      '{result['clean_search']} [2]'  or\n"
-        warning += f"      '{result['clean_search']} #2'  or\n"
-        warning += f"      '{result['clean_search']} (2)'\n"
+        clean_search = result.clean_search
+        parts = [
+            "",
+            "⚠️  DUPLICATE FILES DETECTED!",
+            f"   Search: '{result.search_term}'",
+            f"   Found {result.total_matches} similar files:",
+            "",
+        ]
+        parts.extend(
+            f"   {i}. {file} ({score:.1%})"
+            for i, (file, score) in enumerate(result.matches, 1)
+        )
+        parts += [
+            "",
+            "   💡 To select a specific file, use index notation:",
+            f"      '{clean_search} [2]'  or",
+            f"      '{clean_search} #2'  or",
+            f"      '{clean_search} (2)'",
+            "",
+        ]
         
-        return warning
+        return "\n".join(parts)
 
 
 # Test the enhanced matcher
@@ -262,21 +463,21 @@ if __name__ == '__main__':
     print("\n--- Test 1: Search 'Untitled Document' ---")
     result = matcher.find_matches_with_duplicates("Untitled Document", test_files)
     
-    print(f"Found {len(result['matches'])} matches")
-    print(f"Has duplicates: {result['has_duplicates']}")
+    print(f"Found {len(result.matches)} matches")
+    print(f"Has duplicates: {result.has_duplicates}")
     
-    for i, (file, score) in enumerate(result['matches'], 1):
+    for i, (file, score) in enumerate(result.matches, 1):
         print(f"  {i}. {file} - {score:.2%}")
     
-    if result['has_duplicates']:
+    if result.has_duplicates:
         print(matcher.format_duplicate_warning(result))
     
     # Test 2: Indexed search
     print("\n--- Test 2: Search 'Untitled Document [3]' ---")
     result = matcher.find_matches_with_duplicates("Untitled Document [3]", test_files)
     
-    print(f"Clean search term: '{result['clean_search']}'")
-    print(f"Requested index: {result['requested_index']}")
+    print(f"Clean search term: '{result.clean_search}'")
+    print(f"Requested index: {result.requested_index}")
     
     selection = matcher.select_best_match(result, strategy='indexed')
     if selection:
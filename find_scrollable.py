@@ -53,18 +53,25 @@ def find_scrollable_elements():
     print("\n3. Analyzing the page for scrollable elements...")
     
     # Find all potentially scrollable elements
+    # Walk the DOM in document order without materializing a NodeList, and
+    # only resolve styles for elements whose content actually overflows
     script = """
     let scrollableElements = [];
-    let allElements = document.querySelectorAll('*');
+    // Keep the nodes themselves so the scroll test can index straight into them
+    window.__scrollables__ = [];
+    let walker = document.createTreeWalker(document.documentElement, NodeFilter.SHOW_ELEMENT);
     
-    for (let elem of allElements) {
-        let style = window.getComputedStyle(elem);
-        let overflowY = style.overflowY;
+    for (let elem = walker.currentNode; elem; elem = walker.nextNode()) {
         let scrollHeight = elem.scrollHeight;
         let clientHeight = elem.clientHeight;
+        if (scrollHeight <= clientHeight) {
+            continue;
+        }
+        
+        let overflowY = window.getComputedStyle(elem).overflowY;
         
         // Check if element can scroll
-        if ((overflowY === 'auto' || overflowY === 'scroll') && scrollHeight > clientHeight) {
+        if (overflowY === 'auto' || overflowY === 'scroll') {
             let info = {
                 tag: elem.tagName,
                 classes: elem.className,
@@ -76,6 +83,7 @@ def find_scrollable_elements():
                 ariaLabel: elem.getAttribute('aria-label')
             };
             scrollableElements.push(info);
+            window.__scrollables__.push(elem);
         }
     }
     
@@ -104,31 +112,20 @@ def find_scrollable_elements():
     for i in range(len(scrollable)):
         print(f"Testing element #{i+1}...")
         
-        result = driver.execute_script(f"""
-        let allElements = document.querySelectorAll('*');
-        let scrollableElements = [];
-        
-        for (let elem of allElements) {{
-            let style = window.getComputedStyle(elem);
-            let overflowY = style.overflowY;
-            if ((overflowY === 'auto' || overflowY === 'scroll') && elem.scrollHeight > elem.clientHeight) {{
-                scrollableElements.push(elem);
-            }}
-        }}
-        
-        if (scrollableElements[{i}]) {{
-            let elem = scrollableElements[{i}];
+        result = driver.execute_script("""
+        let elem = (window.__scrollables__ || [])[arguments[0]];
+        if (elem && elem.isConnected) {
             let beforeScroll = elem.scrollTop;
             elem.scrollTop = elem.scrollHeight;
             let afterScroll = elem.scrollTop;
-            return {{
+            return {
                 before: beforeScroll,
                 after: afterScroll,
                 worked: afterScroll > beforeScroll
-            }};
-        }}
+            };
+        }
         return null;
-        """)
+        """, i)
         
         if result and result['worked']:
             print(f"  ✓✓✓ ELEMENT #{i+1} SCROLLED! ✓✓✓")
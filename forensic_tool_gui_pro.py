@@ -7,17 +7,103 @@ Focus on complete API data extraction with optional screenshot support
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import threading
-import json
 import os
+import platform
+import queue
+import subprocess
+import traceback
+from itertools import chain
 from datetime import datetime
-from drive_forensic_tool import DriveForensicTool
-from forensic_verifier import ForensicVerifier
+from drive_forensic_tool import DriveForensicTool, SUMMARY_FIELDS
+from forensic_verifier import ForensicVerifier, StreamingHash, changed_file_ids
+from json_io import dumps, read_json, write_file, write_json
+
+
+# Interval at which queued log lines are flushed into the log box
+LOG_FLUSH_MS = 100
+
+# Interval at which the progress widgets pick up the latest progress (~30 Hz)
+PROGRESS_TICK_MS = 33
+
+# Rule line framing sections of the log
+SEPARATOR = "=" * 80
+
+# Set FORENSIC_DEBUG=1 to include tracebacks of worker thread errors in the log
+DEBUG = bool(os.environ.get("FORENSIC_DEBUG"))
+
+
+# Opens a folder in the platform's file manager
+if platform.system() == "Windows":
+    _open_folder = os.startfile
+elif platform.system() == "Darwin":
+    def _open_folder(path):
+        subprocess.Popen(["open", path])
+else:
+    def _open_folder(path):
+        subprocess.Popen(["xdg-open", path])
+
+
+class _FilesJsonWriter:
+    """
+    Write a JSON object of header fields, a 'files' array and footer fields
+    
+    Records are written one per line as they arrive, so the full list
+    never has to exist in memory. Footer fields (totals, hashes) are
+    written after the array, once they are known.
+    """
+    
+    def __init__(self, path, header):
+        # Written beside the destination and moved into place on close()
+        self._path = path
+        self._file = open(path + '.tmp', 'wb')
+        self._file.write(b'{\n')
+        for key, value in header.items():
+            self._file.write(b'  ' + dumps(key) + b': ' + dumps(value) + b',\n')
+        self._file.write(b'  "files": [')
+        self._separator = b'\n    '
+    
+    def write(self, record):
+        self.write_raw(dumps(record))
+    
+    def write_raw(self, data):
+        """Write a record that is already serialized to JSON bytes"""
+        self._file.write(self._separator + data)
+        self._separator = b',\n    '
+    
+    def close(self, footer):
+        self._file.write(b'\n  ]')
+        for key, value in footer.items():
+            self._file.write(b',\n  ' + dumps(key) + b': ' + dumps(value))
+        self._file.write(b'\n}\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._path + '.tmp', self._path)
+    
+    def abort(self):
+        """Discard a file that was not closed, e.g. after an error; else a no-op"""
+        if self._file.closed:
+            return
+        self._file.close()
+        os.remove(self._path + '.tmp')
+
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
 
 class EnhancedForensicGUI:
+    # Log line icons by level
+    _LOG_ICONS = {
+        "info": "ℹ️",
+        "success": "✓",
+        "warning": "⚠️",
+        "error": "✗"
+    }
+    
+    # First characters of separator lines, which are logged without a timestamp
+    _LOG_SEPARATORS = frozenset({"=", "-", ""})
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Google Drive Comprehensive Metadata Extraction Tool")
@@ -28,15 +114,31 @@ class EnhancedForensicGUI:
         self.verifier = ForensicVerifier()
         self.authenticated = False
         self.current_session = None
-        self.baseline_metadata = []
+        # Export path prefix shared by every file of the current session
+        self._session_prefix = None
         self.session_baseline_hash = None
-        self.all_files_data = []
+        # The baseline itself lives on disk; only its path and file IDs are kept
+        self.baseline_path = None
+        self.baseline_file_ids = []
+        self.baseline_file_hashes = []
+        # Changes API position taken just before the baseline was captured
+        self.changes_start_token = None
         
         # Create output directory
         self.export_dir = 'GoogleDrive_Exports'
         os.makedirs(self.export_dir, exist_ok=True)
         
+        # Log lines are queued and flushed in batches by _drain_log_queue
+        self._log_queue = queue.Queue()
+        
+        # Latest (value, text) progress from worker threads, and what is shown;
+        # _tick_progress copies one to the other
+        self._progress_state = (0, "")
+        self._shown_progress = (0, "")
+        
         self.setup_ui()
+        self._drain_log_queue()
+        self._tick_progress()
         
     def setup_ui(self):
         """Setup enhanced UI with focus on API"""
@@ -216,7 +318,7 @@ class EnhancedForensicGUI:
         
         ctk.CTkRadioButton(
             search_frame,
-            text="Specific file",
+            text="Specific files",
             variable=self.search_type,
             value="specific",
             font=ctk.CTkFont(size=12)
@@ -225,8 +327,8 @@ class EnhancedForensicGUI:
         specific_frame = ctk.CTkFrame(search_frame, fg_color="transparent")
         specific_frame.pack(fill="x", padx=30, pady=(0, 10))
         
-        ctk.CTkLabel(specific_frame, text="File ID:", font=ctk.CTkFont(size=11)).pack(anchor="w")
-        self.file_id_entry = ctk.CTkEntry(specific_frame, placeholder_text="Enter file ID", font=ctk.CTkFont(size=11))
+        ctk.CTkLabel(specific_frame, text="File IDs:", font=ctk.CTkFont(size=11)).pack(anchor="w")
+        self.file_id_entry = ctk.CTkEntry(specific_frame, placeholder_text="Enter file IDs, separated by commas", font=ctk.CTkFont(size=11))
         self.file_id_entry.pack(fill="x", pady=2)
         
         # Extract button
@@ -329,9 +431,9 @@ class EnhancedForensicGUI:
         )
         self.log_text.pack(fill="both", expand=True, padx=10, pady=(0, 10))
         
-        self.log("=" * 80, "info")
+        self.log(SEPARATOR, "info")
         self.log("Google Drive Comprehensive Metadata Extraction Tool", "info")
-        self.log("=" * 80, "info")
+        self.log(SEPARATOR, "info")
         self.log("", "info")
         self.log("This tool extracts COMPLETE metadata from Google Drive API", "info")
         self.log("All operations are READ-ONLY - your files will not be modified", "success")
@@ -340,36 +442,91 @@ class EnhancedForensicGUI:
         
     def log(self, message, level="info"):
         """Enhanced logging with better formatting"""
+        self._log_queue.put(self._format_log(message, level))
+    
+    def log_block(self, entries):
+        """
+        Queue several (message, level) lines as a single log entry
+        
+        The lines share one timestamp and always reach the log box
+        together, never interleaved with lines from another thread.
+        """
         timestamp = datetime.now().strftime("%H:%M:%S")
+        self._log_queue.put("".join(
+            self._format_log(message, level, timestamp) for message, level in entries
+        ))
+    
+    def _format_log(self, message, level, timestamp=None):
+        """Format one log line; the current time is read only if the line shows it"""
+        # Don't add timestamp to separator lines
+        if message[:1] in self._LOG_SEPARATORS:
+            return f"{message}\n"
+        if timestamp is None:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+        icon = self._LOG_ICONS.get(level, "ℹ️")
+        return f"[{timestamp}] {icon} {message}\n"
+    
+    def _drain_log_queue(self):
+        """Insert every queued log line in one go, then reschedule"""
+        lines = []
+        try:
+            while True:
+                lines.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
         
-        icons = {
-            "info": "ℹ️",
-            "success": "✓",
-            "warning": "⚠️",
-            "error": "✗"
-        }
-        icon = icons.get(level, "ℹ️")
+        if lines:
+            self.log_text.insert("end", "".join(lines))
+            self.log_text.see("end")
         
-        # Don't add timestamp to separator lines
-        if message.startswith("=") or message.startswith("-") or message == "":
-            formatted = f"{message}\n"
-        else:
-            formatted = f"[{timestamp}] {icon} {message}\n"
-        
-        self.log_text.insert("end", formatted)
-        self.log_text.see("end")
-        self.root.update()
+        self.root.after(LOG_FLUSH_MS, self._drain_log_queue)
+    
+    def _log_error(self, error):
+        """Log a worker thread error, with its traceback in debug mode"""
+        self.log(f"Error: {error}", "error")
+        if DEBUG:
+            self.log(traceback.format_exc().rstrip(), "error")
+    
+    def _apply_state(self, state):
+        """
+        Apply one UI transition in a single Tk callback
+        
+        state: {widget attribute name: configure() options}
+        """
+        for name, options in state.items():
+            getattr(self, name).configure(**options)
+    
+    def _set_progress(self, value, text=""):
+        """Record progress from any thread; shown on the next tick"""
+        self._progress_state = (value, text)
+    
+    def _tick_progress(self):
+        """Show the latest recorded progress if it changed, then reschedule"""
+        state = self._progress_state
+        if state != self._shown_progress:
+            value, text = state
+            self.progress.set(value)
+            self.progress_label.configure(text=text)
+            self._shown_progress = state
+        
+        self.root.after(PROGRESS_TICK_MS, self._tick_progress)
     
     def clear_log(self):
         """Clear the log"""
+        # Drop lines still waiting for the next flush, or they'd reappear
+        try:
+            while True:
+                self._log_queue.get_nowait()
+        except queue.Empty:
+            pass
         self.log_text.delete("1.0", "end")
         self.log("Log cleared", "info")
     
     def authenticate(self):
         """Authenticate with Google API"""
-        self.log("=" * 80, "info")
+        self.log(SEPARATOR, "info")
         self.log("Starting authentication process...", "info")
-        self.log("=" * 80, "info")
+        self.log(SEPARATOR, "info")
         
         self.auth_btn.configure(state="disabled")
         
@@ -377,40 +534,36 @@ class EnhancedForensicGUI:
             try:
                 self.api_tool = DriveForensicTool()
                 
-                self.root.after(0, lambda: self.log("Checking for credentials...", "info"))
+                self.log("Checking for credentials...", "info")
                 
                 if self.api_tool.authenticate():
                     self.authenticated = True
-                    self.root.after(0, lambda: self.auth_status.configure(
-                        text="🟢 Authenticated Successfully",
-                        text_color="green"
-                    ))
-                    self.root.after(0, lambda: self.account_btn.configure(state="normal"))
-                    self.root.after(0, lambda: self.drives_btn.configure(state="normal"))
-                    self.root.after(0, lambda: self.extract_btn.configure(state="normal"))
+                    self.root.after(0, self._apply_state, {
+                        "auth_status": {"text": "🟢 Authenticated Successfully", "text_color": "green"},
+                        "account_btn": {"state": "normal"},
+                        "drives_btn": {"state": "normal"},
+                        "extract_btn": {"state": "normal"},
+                    })
                     
-                    self.root.after(0, lambda: self.log("✓ Successfully authenticated with READ-ONLY access", "success"))
+                    self.log("✓ Successfully authenticated with READ-ONLY access", "success")
                     
                     # Test read-only
-                    self.root.after(0, lambda: self.log("Testing read-only restriction...", "info"))
+                    self.log("Testing read-only restriction...", "info")
                     if self.api_tool.test_read_only_restriction():
-                        self.root.after(0, lambda: self.log("✓ GOOD: Cannot create files (read-only confirmed)", "success"))
+                        self.log("✓ GOOD: Cannot create files (read-only confirmed)", "success")
                     
-                    self.root.after(0, lambda: self.log("=" * 80, "success"))
-                    self.root.after(0, lambda: self.log("Authentication complete! You can now extract metadata.", "success"))
-                    self.root.after(0, lambda: self.log("=" * 80, "success"))
+                    self.log(SEPARATOR, "success")
+                    self.log("Authentication complete! You can now extract metadata.", "success")
+                    self.log(SEPARATOR, "success")
                 else:
-                    self.root.after(0, lambda: self.log("Authentication failed", "error"))
-                    self.root.after(0, lambda: self.auth_status.configure(
-                        text="🔴 Authentication Failed",
-                        text_color="red"
-                    ))
+                    self.log("Authentication failed", "error")
+                    self.root.after(0, self._apply_state, {
+                        "auth_status": {"text": "🔴 Authentication Failed", "text_color": "red"},
+                    })
             except Exception as e:
-                self.root.after(0, lambda: self.log(f"Error: {e}", "error"))
-                import traceback
-                traceback.print_exc()
+                self._log_error(e)
             finally:
-                self.root.after(0, lambda: self.auth_btn.configure(state="normal"))
+                self.root.after(0, self._apply_state, {"auth_btn": {"state": "normal"}})
         
         threading.Thread(target=auth_thread, daemon=True).start()
     
@@ -420,9 +573,9 @@ class EnhancedForensicGUI:
             messagebox.showerror("Error", "Please authenticate first")
             return
         
-        self.log("=" * 80, "info")
+        self.log(SEPARATOR, "info")
         self.log("Fetching comprehensive account information...", "info")
-        self.log("=" * 80, "info")
+        self.log(SEPARATOR, "info")
         
         self.account_btn.configure(state="disabled")
         
@@ -433,18 +586,17 @@ class EnhancedForensicGUI:
                 if about:
                     # Save to file
                     account_file = os.path.join(self.export_dir, 'account_info.json')
-                    with open(account_file, 'w', encoding='utf-8') as f:
-                        json.dump(about, f, indent=2, default=str)
+                    write_json(account_file, about)
                     
-                    self.root.after(0, lambda: self.log("", "info"))
-                    self.root.after(0, lambda: self.log(f"✓ Account info saved to: {account_file}", "success"))
+                    self.log("", "info")
+                    self.log(f"✓ Account info saved to: {account_file}", "success")
                 else:
-                    self.root.after(0, lambda: self.log("Failed to fetch account info", "error"))
+                    self.log("Failed to fetch account info", "error")
                     
             except Exception as e:
-                self.root.after(0, lambda: self.log(f"Error: {e}", "error"))
+                self.log(f"Error: {e}", "error")
             finally:
-                self.root.after(0, lambda: self.account_btn.configure(state="normal"))
+                self.root.after(0, self._apply_state, {"account_btn": {"state": "normal"}})
         
         threading.Thread(target=account_thread, daemon=True).start()
     
@@ -454,9 +606,9 @@ class EnhancedForensicGUI:
             messagebox.showerror("Error", "Please authenticate first")
             return
         
-        self.log("=" * 80, "info")
+        self.log(SEPARATOR, "info")
         self.log("Fetching shared drives (Team Drives)...", "info")
-        self.log("=" * 80, "info")
+        self.log(SEPARATOR, "info")
         
         self.drives_btn.configure(state="disabled")
         
@@ -467,32 +619,30 @@ class EnhancedForensicGUI:
                 if drives:
                     # Save to file
                     drives_file = os.path.join(self.export_dir, 'shared_drives.json')
-                    with open(drives_file, 'w', encoding='utf-8') as f:
-                        json.dump({
-                            'timestamp': datetime.now().isoformat(),
-                            'drive_count': len(drives),
-                            'drives': drives
-                        }, f, indent=2, default=str)
+                    write_json(drives_file, {
+                        'timestamp': datetime.now().isoformat(),
+                        'drive_count': len(drives),
+                        'drives': drives
+                    })
                     
-                    self.root.after(0, lambda: self.log("", "info"))
-                    self.root.after(0, lambda: self.log(f"✓ Found {len(drives)} shared drives", "success"))
+                    self.log("", "info")
+                    self.log(f"✓ Found {len(drives)} shared drives", "success")
                     
                     for i, drive in enumerate(drives[:10], 1):
                         drive_name = drive.get('name', 'Unknown')
-                        self.root.after(0, lambda i=i, n=drive_name:
-                            self.log(f"  {i}. {n}", "info"))
+                        self.log(f"  {i}. {drive_name}", "info")
                     
                     if len(drives) > 10:
-                        self.root.after(0, lambda: self.log(f"  ... and {len(drives)-10} more", "info"))
+                        self.log(f"  ... and {len(drives)-10} more", "info")
                     
-                    self.root.after(0, lambda: self.log(f"✓ Saved to: {drives_file}", "success"))
+                    self.log(f"✓ Saved to: {drives_file}", "success")
                 else:
-                    self.root.after(0, lambda: self.log("No shared drives found or not accessible", "info"))
+                    self.log("No shared drives found or not accessible", "info")
                     
             except Exception as e:
-                self.root.after(0, lambda: self.log(f"Error: {e}", "error"))
+                self.log(f"Error: {e}", "error")
             finally:
-                self.root.after(0, lambda: self.drives_btn.configure(state="normal"))
+                self.root.after(0, self._apply_state, {"drives_btn": {"state": "normal"}})
         
         threading.Thread(target=drives_thread, daemon=True).start()
     
@@ -502,146 +652,167 @@ class EnhancedForensicGUI:
             messagebox.showerror("Error", "Please authenticate first")
             return
         
-        self.log("=" * 80, "info")
+        self.log(SEPARATOR, "info")
         self.log("Starting comprehensive metadata extraction...", "info")
-        self.log("=" * 80, "info")
+        self.log(SEPARATOR, "info")
         
         self.extract_btn.configure(state="disabled")
-        self.progress.set(0)
+        self._set_progress(0)
         
         def extract_thread():
+            writer = None
             try:
                 search_type = self.search_type.get()
                 files = []
                 
+                # Mark the Changes API position so verification can tell
+                # which files Drive reports as changed since the baseline
+                self.changes_start_token = self.api_tool.get_start_page_token()
+                
                 if search_type == "all":
                     max_results = int(self.max_results.get())
-                    self.root.after(0, lambda: self.log(f"Searching for up to {max_results} files...", "info"))
-                    files = self.api_tool.list_files(max_results=max_results)
+                    self.log(f"Streaming up to {max_results} files...", "info")
+                    # Later listing pages download while earlier files are extracted
+                    listing = self.api_tool.iter_files(
+                        page_size=min(max_results, 1000),
+                        max_results=max_results
+                    )
+                    first = next(listing, None)
+                    if first is not None:
+                        files = chain([first], listing)
                     
                 elif search_type == "date":
                     start = self.start_date.get() or "2024-01-01"
                     end = self.end_date.get() or "2024-12-31"
-                    self.root.after(0, lambda: self.log(f"Searching for files modified between {start} and {end}...", "info"))
+                    self.log(f"Searching for files modified between {start} and {end}...", "info")
                     files = self.api_tool.find_files_by_date_range(
                         f'{start}T00:00:00',
                         f'{end}T23:59:59'
                     )
                     
                 elif search_type == "specific":
-                    file_id = self.file_id_entry.get().strip()
-                    if not file_id:
-                        self.root.after(0, lambda: messagebox.showerror("Error", "Enter a file ID"))
+                    file_ids = self.file_id_entry.get().replace(',', ' ').split()
+                    if not file_ids:
+                        self.root.after(0, messagebox.showerror, "Error", "Enter a file ID")
                         return
                     
-                    self.root.after(0, lambda: self.log(f"Fetching specific file: {file_id}", "info"))
-                    metadata = self.api_tool.get_file_metadata(file_id)
-                    if metadata:
-                        files = [metadata]
+                    if len(file_ids) == 1:
+                        self.log(f"Fetching specific file: {file_ids[0]}", "info")
+                        metadata = self.api_tool.get_file_metadata(file_ids[0])
+                        if metadata:
+                            files = [metadata]
+                    else:
+                        # One batch request per 100 IDs instead of a call per file
+                        self.log(f"Fetching {len(file_ids)} specific files...", "info")
+                        metadata = self.api_tool.get_file_metadata_batch(file_ids, fields=SUMMARY_FIELDS)
+                        files = [metadata[file_id] for file_id in dict.fromkeys(file_ids) if file_id in metadata]
                 
                 if not files:
-                    self.root.after(0, lambda: self.log("No files found", "warning"))
+                    self.log("No files found", "warning")
                     return
                 
-                self.root.after(0, lambda: self.log(f"✓ Found {len(files)} files", "success"))
-                
-                # Show sample of files
-                self.root.after(0, lambda: self.log("--- Files Found ---", "info"))
-                for i, f in enumerate(files[:10], 1):
-                    file_name = f.get('name', 'Unknown')
-                    modified = f.get('modifiedTime', 'N/A')
-                    self.root.after(0, lambda i=i, name=file_name, mod=modified:
-                        self.log(f"  {i}. {name} (Modified: {mod})", "info"))
-                
-                if len(files) > 10:
-                    remaining = len(files) - 10
-                    self.root.after(0, lambda r=remaining: self.log(f"  ... and {r} more", "info"))
-                
-                self.root.after(0, lambda: self.log("-------------------", "info"))
+                if isinstance(files, list):
+                    total = len(files)
+                    self.log(f"✓ Found {len(files)} files", "success")
+                    
+                    # Show sample of files
+                    self.log("--- Files Found ---", "info")
+                    for i, f in enumerate(files[:10], 1):
+                        file_name = f.get('name', 'Unknown')
+                        modified = f.get('modifiedTime', 'N/A')
+                        self.log(f"  {i}. {file_name} (Modified: {modified})", "info")
+                    
+                    if len(files) > 10:
+                        remaining = len(files) - 10
+                        self.log(f"  ... and {remaining} more", "info")
+                    
+                    self.log("-------------------", "info")
+                else:
+                    # Streamed listing: the count is only known at the end
+                    total = max_results
                 
                 # Create session
                 self.current_session = datetime.now().strftime('%Y%m%d_%H%M%S')
-                self.root.after(0, lambda: self.log(f"Session ID: {self.current_session}", "info"))
+                self._session_prefix = os.path.join(self.export_dir, f'session_{self.current_session}_')
+                self.log(f"Session ID: {self.current_session}", "info")
                 
                 # Get COMPREHENSIVE data for each file (metadata + revisions + comments)
-                self.root.after(0, lambda: self.log("", "info"))
-                self.root.after(0, lambda: self.log("=" * 80, "info"))
-                self.root.after(0, lambda: self.log("Extracting COMPREHENSIVE data (metadata + activity log + comments)...", "info"))
-                self.root.after(0, lambda: self.log("=" * 80, "info"))
-                
-                comprehensive_data = []
-                total = len(files)
-                
-                for i, file in enumerate(files, 1):
-                    progress = i / total
-                    self.root.after(0, lambda p=progress: self.progress.set(p))
-                    self.root.after(0, lambda i=i, t=total: self.progress_label.configure(text=f"Processing {i}/{t}"))
+                self.log("", "info")
+                self.log(SEPARATOR, "info")
+                self.log("Extracting COMPREHENSIVE data (metadata + activity log + comments)...", "info")
+                self.log(SEPARATOR, "info")
+                
+                # Stream the baseline to disk as each file arrives; only the
+                # file IDs, running totals and hash are kept in memory
+                baseline_path = self._session_prefix + 'BASELINE.json'
+                writer = _FilesJsonWriter(baseline_path, {
+                    'session_id': self.current_session,
+                    'capture_time': datetime.now().isoformat(),
+                })
+                baseline_hash = StreamingHash()
+                baseline_file_ids = []
+                total_revisions = total_comments = total_permissions = 0
+                
+                # Get EVERYTHING: metadata + revisions + comments + permissions + labels,
+                # with the lookups for many files packed into each batch request
+                file_ids = (file.get('id') for file in files)
+                all_comp_data = self.api_tool.iter_comprehensive_file_data(file_ids)
+                
+                for i, comp_data in enumerate(all_comp_data, 1):
+                    self._set_progress(i / total, f"Processing {i}/{total}")
                     
-                    file_id = file.get('id')
-                    file_name = file.get('name', 'Unknown')
+                    file_name = comp_data.get('metadata', {}).get('name', 'Unknown')
                     
-                    self.root.after(0, lambda n=file_name, i=i, t=total: self.log(f"[{i}/{t}] {n}", "info"))
+                    self.log(f"[{i}/{total}] {file_name}", "info")
                     
-                    # Get EVERYTHING: metadata + revisions + comments + permissions + labels
-                    comp_data = self.api_tool.get_comprehensive_file_data(file_id)
-                    comprehensive_data.append(comp_data)
+                    # Serialized once: the same bytes are hashed and written
+                    writer.write_raw(baseline_hash.update(comp_data))
+                    baseline_file_ids.append(comp_data.get('file_id'))
                     
                     # Log what we got
                     rev_count = comp_data.get('revision_count', 0)
                     comment_count = comp_data.get('comment_count', 0)
                     perm_count = comp_data.get('permission_count', 0)
                     has_labels = bool(comp_data.get('labels', {}))
+                    total_revisions += rev_count
+                    total_comments += comment_count
+                    total_permissions += perm_count
                     
-                    self.root.after(0, lambda rc=rev_count, cc=comment_count, pc=perm_count, hl=has_labels: 
-                        self.log(f"  → {rc} revisions, {cc} comments, {pc} permissions" + 
-                                 (" + labels" if hl else ""), "info"))
-                
-                self.baseline_metadata = comprehensive_data
-                self.all_files_data = comprehensive_data
+                    self.log(f"  → {rev_count} revisions, {comment_count} comments, {perm_count} permissions" +
+                             (" + labels" if has_labels else ""), "info")
                 
-                # Generate hash
-                self.session_baseline_hash = self.verifier.generate_hash(comprehensive_data)
+                # Finish the baseline with its totals and hash
+                self.session_baseline_hash = baseline_hash.hexdigest()
+                writer.close({
+                    'total_files': len(baseline_file_ids),
+                    'baseline_hash_sha256': self.session_baseline_hash,
+                    'file_hashes_sha256': dict(zip(baseline_file_ids, baseline_hash.item_hashes)),
+                })
                 
-                # Save baseline
-                baseline_path = os.path.join(
-                    self.export_dir,
-                    f'session_{self.current_session}_BASELINE.json'
-                )
-                
-                with open(baseline_path, 'w', encoding='utf-8') as f:
-                    json.dump({
-                        'session_id': self.current_session,
-                        'capture_time': datetime.now().isoformat(),
-                        'total_files': len(comprehensive_data),
-                        'baseline_hash_sha256': self.session_baseline_hash,
-                        'files': comprehensive_data
-                    }, f, indent=2, default=str)
+                self.baseline_path = baseline_path
+                self.baseline_file_ids = baseline_file_ids
+                self.baseline_file_hashes = baseline_hash.item_hashes
                 
-                self.root.after(0, lambda: self.log("", "info"))
-                self.root.after(0, lambda: self.log("=" * 80, "success"))
-                self.root.after(0, lambda: self.log(f"Extraction complete! Processed {len(comprehensive_data)} files", "success"))
+                self.log("", "info")
+                self.log(SEPARATOR, "success")
+                self.log(f"Extraction complete! Processed {len(baseline_file_ids)} files", "success")
                 
                 # Summary stats
-                total_revisions = sum(f.get('revision_count', 0) for f in comprehensive_data)
-                total_comments = sum(f.get('comment_count', 0) for f in comprehensive_data)
-                total_permissions = sum(f.get('permission_count', 0) for f in comprehensive_data)
-                self.root.after(0, lambda tr=total_revisions, tc=total_comments, tp=total_permissions: 
-                    self.log(f"Total: {tr} revisions, {tc} comments, {tp} permissions extracted", "success"))
+                self.log(f"Total: {total_revisions} revisions, {total_comments} comments, {total_permissions} permissions extracted", "success")
                 
-                self.root.after(0, lambda: self.log(f"Baseline hash: {self.session_baseline_hash}", "info"))
-                self.root.after(0, lambda: self.log(f"Saved to: {baseline_path}", "info"))
-                self.root.after(0, lambda: self.log("=" * 80, "success"))
+                self.log(f"Baseline hash: {self.session_baseline_hash}", "info")
+                self.log(f"Saved to: {baseline_path}", "info")
+                self.log(SEPARATOR, "success")
                 
-                self.root.after(0, lambda: self.verify_btn.configure(state="normal"))
+                self.root.after(0, self._apply_state, {"verify_btn": {"state": "normal"}})
                 
             except Exception as e:
-                self.root.after(0, lambda: self.log(f"Error: {e}", "error"))
-                import traceback
-                traceback.print_exc()
+                self._log_error(e)
             finally:
-                self.root.after(0, lambda: self.extract_btn.configure(state="normal"))
-                self.root.after(0, lambda: self.progress.set(0))
-                self.root.after(0, lambda: self.progress_label.configure(text=""))
+                if writer is not None:
+                    writer.abort()
+                self.root.after(0, self._apply_state, {"extract_btn": {"state": "normal"}})
+                self._set_progress(0)
         
         threading.Thread(target=extract_thread, daemon=True).start()
     
@@ -651,139 +822,144 @@ class EnhancedForensicGUI:
             messagebox.showerror("Error", "No active session to verify")
             return
         
-        self.log("=" * 80, "info")
+        self.log(SEPARATOR, "info")
         self.log("Verifying data integrity (including activity log)...", "info")
-        self.log("=" * 80, "info")
+        self.log(SEPARATOR, "info")
         
         self.verify_btn.configure(state="disabled")
         
         def verify_thread():
+            writer = None
             try:
                 # Re-capture comprehensive data
-                self.root.after(0, lambda: self.log("Re-capturing comprehensive metadata for verification...", "info"))
-                
-                post_data = []
-                total = len(self.baseline_metadata)
-                
-                for i, baseline_item in enumerate(self.baseline_metadata, 1):
-                    progress = i / total
-                    self.root.after(0, lambda p=progress: self.progress.set(p))
-                    self.root.after(0, lambda i=i, t=total: self.progress_label.configure(text=f"Re-capturing {i}/{t}"))
-                    
-                    file_id = baseline_item.get('file_id') or baseline_item.get('metadata', {}).get('id')
-                    
-                    # Re-fetch everything
-                    comp_data = self.api_tool.get_comprehensive_file_data(file_id)
-                    post_data.append(comp_data)
-                
-                # Generate new hash
-                post_hash = self.verifier.generate_hash(post_data)
-                
-                # Save post-capture
-                post_path = os.path.join(
-                    self.export_dir,
-                    f'session_{self.current_session}_POST.json'
+                self.log("Re-capturing comprehensive metadata for verification...", "info")
+                
+                baseline_data = read_json(self.baseline_path)['files']
+                total = len(self.baseline_file_ids)
+                
+                def on_result(i, comp_data):
+                    self._set_progress(i / total, f"Re-capturing {i}/{total}")
+                
+                # Files Drive reports as changed are re-fetched in full, the rest
+                # get fresh metadata only (None means re-fetch everything)
+                changed_ids = self.api_tool.changed_file_ids(self.changes_start_token)
+                if changed_ids is not None:
+                    self.log(f"Drive reports {len(changed_ids)} changed file(s) since baseline", "info")
+                
+                # Several files at a time, kept in baseline order
+                post_data = self.api_tool.recapture_comprehensive(baseline_data, changed_ids, on_result=on_result)
+                
+                # Save post-capture, hashing each file's JSON as it is written
+                post_path = self._session_prefix + 'POST.json'
+                
+                writer = _FilesJsonWriter(post_path, {
+                    'session_id': self.current_session,
+                    'capture_time': datetime.now().isoformat(),
+                })
+                post_hasher = StreamingHash()
+                for comp_data in post_data:
+                    writer.write_raw(post_hasher.update(comp_data))
+                post_hash = post_hasher.hexdigest()
+                writer.close({
+                    'total_files': len(post_data),
+                    'post_hash_sha256': post_hash,
+                    'file_hashes_sha256': dict(zip(self.baseline_file_ids, post_hasher.item_hashes)),
+                })
+                
+                # Per-file hashes pinpoint exactly which files differ
+                changed_files = changed_file_ids(
+                    self.baseline_file_ids, self.baseline_file_hashes, post_hasher.item_hashes
                 )
                 
-                with open(post_path, 'w', encoding='utf-8') as f:
-                    json.dump({
-                        'session_id': self.current_session,
-                        'capture_time': datetime.now().isoformat(),
-                        'total_files': len(post_data),
-                        'post_hash_sha256': post_hash,
-                        'files': post_data
-                    }, f, indent=2, default=str)
-                
                 # Compare
-                result = self.verifier.verify_no_changes(self.baseline_metadata, post_data)
+                baseline_hash = self.session_baseline_hash
+                hashes_match = baseline_hash == post_hash
+                result = self.verifier.verify_no_changes(
+                    baseline_data, post_data,
+                    before_hash=baseline_hash,
+                    after_hash=post_hash
+                )
                 
                 # Save verification
-                verification_path = os.path.join(
-                    self.export_dir,
-                    f'session_{self.current_session}_VERIFICATION.json'
-                )
+                verification_path = self._session_prefix + 'VERIFICATION.json'
                 
-                with open(verification_path, 'w', encoding='utf-8') as f:
-                    json.dump({
-                        'session_id': self.current_session,
-                        'baseline_hash': self.session_baseline_hash,
-                        'post_hash': post_hash,
-                        'hashes_match': self.session_baseline_hash == post_hash,
-                        'verification_result': result
-                    }, f, indent=2, default=str)
+                write_json(verification_path, {
+                    'session_id': self.current_session,
+                    'baseline_hash': baseline_hash,
+                    'post_hash': post_hash,
+                    'hashes_match': hashes_match,
+                    'changed_file_ids': changed_files,
+                    'verification_result': result
+                })
                 
                 # Attestation
                 attestation = self.verifier.generate_attestation(result)
-                attestation_with_hashes = f"""
-SESSION: {self.current_session}
-
-HASH COMPARISON:
-  Baseline Hash: {self.session_baseline_hash}
-  Post Hash:     {post_hash}
-  Match:         {self.session_baseline_hash == post_hash}
-
-{attestation}
-"""
-                
-                attestation_path = os.path.join(
-                    self.export_dir,
-                    f'session_{self.current_session}_ATTESTATION.txt'
-                )
-                with open(attestation_path, 'w', encoding='utf-8') as f:
-                    f.write(attestation_with_hashes)
-                
-                # Results
-                self.root.after(0, lambda: self.log("", "info"))
-                self.root.after(0, lambda: self.log("=" * 80, "info"))
-                self.root.after(0, lambda: self.log("VERIFICATION RESULTS:", "info"))
-                self.root.after(0, lambda: self.log("=" * 80, "info"))
-                self.root.after(0, lambda: self.log(f"Baseline Hash: {self.session_baseline_hash}", "info"))
-                self.root.after(0, lambda: self.log(f"Post Hash:     {post_hash}", "info"))
-                
-                if self.session_baseline_hash == post_hash:
-                    self.root.after(0, lambda: self.log("", "info"))
-                    self.root.after(0, lambda: self.log("✓✓✓ VERIFICATION PASSED ✓✓✓", "success"))
-                    self.root.after(0, lambda: self.log("No changes detected - data integrity confirmed", "success"))
-                    self.root.after(0, lambda: self.log("All metadata, revisions, and comments are identical", "success"))
-                    self.root.after(0, lambda: self.log("=" * 80, "success"))
-                    self.root.after(0, lambda: messagebox.showinfo(
+                attestation_with_hashes = b"".join([
+                    b"\nSESSION: ", str(self.current_session).encode('utf-8'),
+                    b"\n\nHASH COMPARISON:\n  Baseline Hash: ", str(baseline_hash).encode('ascii'),
+                    b"\n  Post Hash:     ", post_hash.encode('ascii'),
+                    b"\n  Match:         ", str(hashes_match).encode('ascii'),
+                    b"\n\n", attestation.encode('utf-8'), b"\n",
+                ])
+                
+                attestation_path = self._session_prefix + 'ATTESTATION.txt'
+                write_file(attestation_path, attestation_with_hashes)
+                
+                # Results, queued as one block
+                results = [
+                    ("", "info"),
+                    (SEPARATOR, "info"),
+                    ("VERIFICATION RESULTS:", "info"),
+                    (SEPARATOR, "info"),
+                    (f"Baseline Hash: {baseline_hash}", "info"),
+                    (f"Post Hash:     {post_hash}", "info"),
+                ]
+                
+                if hashes_match:
+                    results += [
+                        ("", "info"),
+                        ("✓✓✓ VERIFICATION PASSED ✓✓✓", "success"),
+                        ("No changes detected - data integrity confirmed", "success"),
+                        ("All metadata, revisions, and comments are identical", "success"),
+                        (SEPARATOR, "success"),
+                    ]
+                    dialog = (
+                        messagebox.showinfo,
                         "Success",
                         f"Integrity verified!\n\nFiles: {len(post_data)}\nHashes match: YES\nAll activity logs preserved"
-                    ))
+                    )
                 else:
-                    self.root.after(0, lambda: self.log("", "info"))
-                    self.root.after(0, lambda: self.log("✗✗✗ VERIFICATION FAILED ✗✗✗", "error"))
-                    self.root.after(0, lambda: self.log("Changes detected! Review verification report.", "error"))
-                    self.root.after(0, lambda: self.log("=" * 80, "error"))
-                    self.root.after(0, lambda: messagebox.showwarning("Failed", "Hashes don't match!"))
-                
-                self.root.after(0, lambda: self.log(f"Verification saved to: {verification_path}", "info"))
-                self.root.after(0, lambda: self.log(f"Attestation saved to: {attestation_path}", "info"))
+                    results += [
+                        ("", "info"),
+                        ("✗✗✗ VERIFICATION FAILED ✗✗✗", "error"),
+                        ("Changes detected! Review verification report.", "error"),
+                        (f"{len(changed_files)} file(s) differ from the baseline", "error"),
+                        (SEPARATOR, "error"),
+                    ]
+                    dialog = (messagebox.showwarning, "Failed", "Hashes don't match!")
+                
+                results += [
+                    (f"Verification saved to: {verification_path}", "info"),
+                    (f"Attestation saved to: {attestation_path}", "info"),
+                ]
+                self.log_block(results)
+                # After the next log flush, so the results are visible behind the dialog
+                self.root.after(LOG_FLUSH_MS, *dialog)
                 
             except Exception as e:
-                self.root.after(0, lambda: self.log(f"Error: {e}", "error"))
-                import traceback
-                traceback.print_exc()
+                self._log_error(e)
             finally:
-                self.root.after(0, lambda: self.verify_btn.configure(state="normal"))
-                self.root.after(0, lambda: self.progress.set(0))
-                self.root.after(0, lambda: self.progress_label.configure(text=""))
+                if writer is not None:
+                    writer.abort()
+                self.root.after(0, self._apply_state, {"verify_btn": {"state": "normal"}})
+                self._set_progress(0)
         
         threading.Thread(target=verify_thread, daemon=True).start()
     
     def open_export_folder(self):
         """Open the export folder"""
-        import subprocess
-        import platform
-        
         try:
-            if platform.system() == "Windows":
-                os.startfile(self.export_dir)
-            elif platform.system() == "Darwin":
-                subprocess.Popen(["open", self.export_dir])
-            else:
-                subprocess.Popen(["xdg-open", self.export_dir])
-            
+            _open_folder(self.export_dir)
             self.log(f"Opened folder: {self.export_dir}", "info")
         except Exception as e:
             self.log(f"Could not open folder: {e}", "error")
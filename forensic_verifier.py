@@ -8,6 +8,95 @@ import json
 import hashlib
 from datetime import datetime
 
+from json_io import write_json
+
+# hashlib's SHA-256 is OpenSSL's, which picks SHA-NI / AVX2 code at runtime
+# and releases the GIL on large inputs; bound once for the per-item hashing
+_sha256 = hashlib.sha256
+
+# Record fields set by the capture itself rather than read from Drive;
+# left out of per-file digests so a re-capture of an unchanged file matches
+CAPTURE_TIME_FIELDS = frozenset({'fetch_time'})
+
+
+class StreamingHash:
+    """
+    SHA-256 of a list that is built up one item at a time
+    
+    Gives the same digest as ForensicVerifier.generate_hash() on the
+    complete list, without the list ever being held in memory. Each
+    item's record_digest() is kept in item_hashes, so two captures can be
+    compared file by file.
+    """
+    
+    def __init__(self):
+        self._hash = _sha256(b'[')
+        self._separator = b''
+        self.item_hashes = []
+    
+    def update(self, item):
+        """
+        Append one list item to the hashed data
+        
+        Returns:
+            bytes: The item's canonical JSON, for callers that also write it
+                   out and so need not serialize it a second time
+        """
+        data, core = _canonical(item)
+        self._hash.update(self._separator)
+        self._hash.update(data)
+        self._separator = b', '
+        self.item_hashes.append(_sha256(core).hexdigest())
+        return data
+    
+    def hexdigest(self):
+        """SHA-256 hex digest of the items added so far"""
+        final = self._hash.copy()
+        final.update(b']')
+        return final.hexdigest()
+
+
+def _canonical(item):
+    """
+    Canonical JSON of item, with and without its capture-time fields
+    
+    Both encodings equal json.dumps(..., sort_keys=True). For a record,
+    each top-level field is serialized once and the two encodings are
+    joined from the same pieces.
+    
+    Returns:
+        (bytes, bytes): The full encoding and the one without capture-time fields
+    """
+    if not isinstance(item, dict) or CAPTURE_TIME_FIELDS.isdisjoint(item):
+        data = json.dumps(item, sort_keys=True).encode('utf-8')
+        return data, data
+    
+    fields = [
+        (key, f"{json.dumps(key)}: {json.dumps(value, sort_keys=True)}")
+        for key, value in sorted(item.items())
+    ]
+    data = '{' + ', '.join(field for _, field in fields) + '}'
+    core = '{' + ', '.join(field for key, field in fields if key not in CAPTURE_TIME_FIELDS) + '}'
+    return data.encode('utf-8'), core.encode('utf-8')
+
+
+def record_digest(record):
+    """SHA-256 of a capture record's canonical JSON, without capture-time fields"""
+    return _sha256(_canonical(record)[1]).hexdigest()
+
+
+def changed_file_ids(file_ids, before_hashes, after_hashes):
+    """
+    IDs of the files whose record_digest() differs between two captures
+    
+    All three sequences are in capture order.
+    """
+    return [
+        file_id
+        for file_id, before, after in zip(file_ids, before_hashes, after_hashes)
+        if before != after
+    ]
+
 
 class ForensicVerifier:
     """
@@ -32,7 +121,7 @@ class ForensicVerifier:
         json_str = json.dumps(metadata, sort_keys=True)
         
         # Generate SHA-256 hash
-        hash_obj = hashlib.sha256(json_str.encode('utf-8'))
+        hash_obj = _sha256(json_str.encode('utf-8'))
         return hash_obj.hexdigest()
     
     def generate_file_hash(self, file_metadata):
@@ -54,15 +143,23 @@ class ForensicVerifier:
         
         return self.generate_hash(critical_data)
     
-    def verify_no_changes(self, before_metadata, after_metadata):
+    def verify_no_changes(self, before_metadata, after_metadata,
+                          before_hash=None, after_hash=None):
         """
         Compare before and after metadata
         
+        Args:
+            before_hash, after_hash: generate_hash() digests of the two
+                captures, if already known (e.g. from StreamingHash), so
+                the full data need not be serialized and hashed again
+        
         Returns:
             dict: Verification result with details
         """
-        before_hash = self.generate_hash(before_metadata)
-        after_hash = self.generate_hash(after_metadata)
+        if before_hash is None:
+            before_hash = self.generate_hash(before_metadata)
+        if after_hash is None:
+            after_hash = self.generate_hash(after_metadata)
         
         result = {
             'timestamp': datetime.now().isoformat(),
@@ -142,8 +239,7 @@ class ForensicVerifier:
             'verifications': self.verification_log
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2)
+        write_json(filename, report)
         
         return filename
     
@@ -4,11 +4,12 @@ Google Drive Comprehensive Forensic Workflow - Enhanced Version
 Command-line interface for extracting ALL metadata from Google Drive API
 """
 
+import os
 import sys
-import json
 from datetime import datetime
 from drive_forensic_tool_enhanced import DriveForensicToolEnhanced
 from forensic_verifier import ForensicVerifier
+from json_io import write_file, write_json
 
 
 def forensic_workflow_enhanced():
@@ -51,8 +52,7 @@ def forensic_workflow_enhanced():
     
     about = api_tool.get_about_info()
     if about:
-        with open('account_info.json', 'w', encoding='utf-8') as f:
-            json.dump(about, f, indent=2, default=str)
+        write_json('account_info.json', about)
         print("✓ Account info saved to: account_info.json")
     
     # ========================================
@@ -134,6 +134,7 @@ def forensic_workflow_enhanced():
     
     # Create session
     session_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+    session_prefix = f'session_{session_id}_'
     print(f"\nSession ID: {session_id}")
     
     # Extract comprehensive data
@@ -151,15 +152,14 @@ def forensic_workflow_enhanced():
     baseline_hash = verifier.generate_hash(comprehensive_data)
     
     # Save baseline
-    baseline_file = f'session_{session_id}_BASELINE.json'
-    with open(baseline_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'session_id': session_id,
-            'capture_time': datetime.now().isoformat(),
-            'total_files': len(comprehensive_data),
-            'baseline_hash_sha256': baseline_hash,
-            'files': comprehensive_data
-        }, f, indent=2, default=str)
+    baseline_file = session_prefix + 'BASELINE.json'
+    write_json(baseline_file, {
+        'session_id': session_id,
+        'capture_time': datetime.now().isoformat(),
+        'total_files': len(comprehensive_data),
+        'baseline_hash_sha256': baseline_hash,
+        'files': comprehensive_data
+    })
     
     print(f"\n✓ Baseline saved: {baseline_file}")
     print(f"✓ Baseline hash: {baseline_hash}")
@@ -187,32 +187,34 @@ def forensic_workflow_enhanced():
         post_hash = verifier.generate_hash(post_data)
         
         # Save post-capture
-        post_file = f'session_{session_id}_POST.json'
-        with open(post_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'session_id': session_id,
-                'capture_time': datetime.now().isoformat(),
-                'total_files': len(post_data),
-                'post_hash_sha256': post_hash,
-                'files': post_data
-            }, f, indent=2, default=str)
+        post_file = session_prefix + 'POST.json'
+        write_json(post_file, {
+            'session_id': session_id,
+            'capture_time': datetime.now().isoformat(),
+            'total_files': len(post_data),
+            'post_hash_sha256': post_hash,
+            'files': post_data
+        })
         
         print(f"\n✓ Post-capture saved: {post_file}")
         print(f"✓ Post hash: {post_hash}")
         
         # Compare
-        result = verifier.verify_no_changes(comprehensive_data, post_data)
+        result = verifier.verify_no_changes(
+            comprehensive_data, post_data,
+            before_hash=baseline_hash,
+            after_hash=post_hash
+        )
         
         # Save verification
-        verification_file = f'session_{session_id}_VERIFICATION.json'
-        with open(verification_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'session_id': session_id,
-                'baseline_hash': baseline_hash,
-                'post_hash': post_hash,
-                'hashes_match': baseline_hash == post_hash,
-                'verification_result': result
-            }, f, indent=2, default=str)
+        verification_file = session_prefix + 'VERIFICATION.json'
+        write_json(verification_file, {
+            'session_id': session_id,
+            'baseline_hash': baseline_hash,
+            'post_hash': post_hash,
+            'hashes_match': baseline_hash == post_hash,
+            'verification_result': result
+        })
         
         # Generate attestation
         attestation = verifier.generate_attestation(result)
@@ -227,9 +229,8 @@ HASH COMPARISON:
 {attestation}
 """
         
-        attestation_file = f'session_{session_id}_ATTESTATION.txt'
-        with open(attestation_file, 'w', encoding='utf-8') as f:
-            f.write(attestation_with_hashes)
+        attestation_file = session_prefix + 'ATTESTATION.txt'
+        write_file(attestation_file, attestation_with_hashes.encode('utf-8'))
         
         # Results
         print("\n" + "=" * 70)
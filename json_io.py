@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+JSON Serialization and Atomic File Writes
+Shared by every tool that reads or writes forensic artifacts
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj, indent=False):
+    """
+    Serialize obj to JSON bytes, using orjson when available
+    
+    indent: Indent with 2 spaces instead of writing compact JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None, default=str)
+    return json.dumps(obj, indent=2 if indent else None, default=str).encode('utf-8')
+
+
+def loads(raw):
+    """Deserialize JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def read_json(path):
+    """Load a JSON file"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def write_file(path, data):
+    """
+    Write bytes to path straight through a raw file descriptor
+    
+    The file is written beside its destination, synced and moved into
+    place, so a crash never leaves a truncated file behind.
+    """
+    tmp_path = path + '.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def write_json(path, obj):
+    """Write obj to path as 2-space indented JSON, atomically"""
+    write_file(path, dumps(obj, indent=True))
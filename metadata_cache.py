@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Local Metadata Cache
+Stores Drive metadata keyed by file ID and version so unchanged files skip the API
+"""
+
+import sqlite3
+import threading
+
+from json_io import dumps, loads
+
+
+class MetadataCache:
+    """
+    SQLite-backed cache of Drive API responses
+    
+    Entries are keyed by (file_id, fields) and tagged with the file's Drive
+    `version`, which increases on every server-side change. A lookup only
+    hits when the stored version matches the current one.
+    """
+    
+    def __init__(self, db_path='metadata_cache.db'):
+        """
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS metadata ("
+            "file_id TEXT NOT NULL, "
+            "fields TEXT NOT NULL, "
+            "version TEXT, "
+            "payload BLOB NOT NULL, "
+            "PRIMARY KEY (file_id, fields))"
+        )
+        self._conn.commit()
+    
+    def get(self, file_id, version, fields=''):
+        """
+        Return the cached payload for file_id, or None if missing or stale
+        """
+        if version is None:
+            return None
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, payload FROM metadata WHERE file_id = ? AND fields = ?",
+                (file_id, fields)
+            ).fetchone()
+        
+        if row is None or row[0] != str(version):
+            return None
+        return self._decode(row[1])
+    
+    def put(self, file_id, version, payload, fields=''):
+        """Store payload for file_id at the given version"""
+        if version is None:
+            return
+        
+        blob = self._encode(payload)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata (file_id, fields, version, payload) "
+                "VALUES (?, ?, ?, ?)",
+                (file_id, fields, str(version), blob)
+            )
+            self._conn.commit()
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+    
+    @staticmethod
+    def _encode(payload):
+        """Serialize a payload to bytes"""
+        return dumps(payload)
+    
+    @staticmethod
+    def _decode(blob):
+        """Deserialize a stored payload"""
+        return loads(blob)
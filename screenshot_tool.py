@@ -20,6 +20,11 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.service import Service
 
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
 # ✅ MANUAL CHROMEDRIVER PATH (download instructions in CHROMEDRIVER_FIX_INSTRUCTIONS.md)
 CHROMEDRIVER_PATH = r"C:\Users\rtrin\Downloads\chromedriver-141\chromedriver-win64\chromedriver.exe"
 
@@ -39,6 +44,10 @@ def _windows_chrome_profile_dir() -> str:
 # DUPLICATE FILE HANDLING FUNCTIONS
 # ==============================================================================
 
+# Trailing index notation: [2], #2 or (2)
+_INDEX_RE = re.compile(r'\s*(?:\[(\d+)\]|#(\d+)|\((\d+)\))\s*$')
+
+
 def parse_index_from_search(search_term: str):
     """
     Parse index notation from search term
@@ -49,14 +58,11 @@ def parse_index_from_search(search_term: str):
         "Resume (1)" → ("Resume", 1)
         "Resume" → ("Resume", None)
     """
-    patterns = [r'\s*\[(\d+)\]\s*$', r'\s*#(\d+)\s*$', r'\s*\((\d+)\)\s*$']
-    
-    for pattern in patterns:
-        match = re.search(pattern, search_term)
-        if match:
-            index = int(match.group(1))
-            clean_term = re.sub(pattern, '', search_term).strip()
-            return (clean_term, index)
+    match = _INDEX_RE.search(search_term)
+    if match:
+        index = int(next(group for group in match.groups() if group))
+        clean_term = search_term[:match.start()].strip()
+        return (clean_term, index)
     
     return (search_term, None)
 
@@ -72,7 +78,10 @@ def calculate_similarity(search_term: str, candidate: str) -> float:
     if search_lower in candidate_lower:
         return 0.85 + (0.15 * len(search_lower) / len(candidate_lower))
     
-    base_similarity = SequenceMatcher(None, search_lower, candidate_lower).ratio()
+    if fuzz is not None:
+        base_similarity = fuzz.ratio(search_lower, candidate_lower) / 100
+    else:
+        base_similarity = SequenceMatcher(None, search_lower, candidate_lower).ratio()
     
     search_words = set(search_lower.split())
     candidate_words = set(candidate_lower.split())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for analyze_api_results
+Run from the repository root: python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from analyze_api_results import _load_json, analyze_extraction_results
+
+
+class CompressedReportTest(unittest.TestCase):
+    
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        # The screenshot queue is written to the working directory
+        os.chdir(self._tmp.name)
+    
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+    
+    def test_compressed_reports_round_trip(self):
+        baseline = {
+            'session_id': 'test',
+            'files': [
+                {'file_id': 'a', 'metadata': {'name': 'a.docx'}, 'revision_count': 2},
+                {'file_id': 'b', 'metadata': {'name': 'b.docx'}, 'comment_count': 1},
+            ],
+        }
+        with open('session_test_BASELINE.json', 'w', encoding='utf-8') as f:
+            json.dump(baseline, f)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyze_extraction_results(os.path.join('.', 'session_test_BASELINE.json'), compress=True)
+        
+        report = _load_json(os.path.join('.', 'session_test_NEEDS_SCREENSHOTS.json.gz'))
+        self.assertEqual(report['files_with_revisions'], 1)
+        self.assertEqual(report['files_without_revisions'], 1)
+        self.assertEqual([f['file_id'] for f in report['files']], ['b'])
+        
+        queue = _load_json('screenshot_queue_test.json.gz')
+        self.assertEqual(queue['total_files'], 1)
+        self.assertEqual(queue['files'][0]['file_name'], 'b.docx')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests for drive_forensic_tool against an in-memory Drive service
+Run from the repository root: python -m unittest discover tests
+"""
+
+import importlib
+import sys
+import types
+import unittest
+
+from forensic_verifier import StreamingHash, changed_file_ids
+
+
+def _stub_module(name, **attrs):
+    """Register a stand-in for name (and its parents) unless it can be imported"""
+    try:
+        importlib.import_module(name)
+        return
+    except ImportError:
+        pass
+    parts = name.split('.')
+    for depth in range(1, len(parts) + 1):
+        sys.modules.setdefault('.'.join(parts[:depth]), types.ModuleType('.'.join(parts[:depth])))
+    sys.modules[name].__dict__.update(attrs)
+
+
+class _HttpError(Exception):
+    def __init__(self, resp, content, uri=None):
+        super().__init__(resp.status)
+        self.resp = resp
+        self.content = content
+
+
+# The Drive client libraries are only imported, never called, by the code
+# under test; stand-ins let the tests run where they are not installed
+_stub_module('httplib2', Http=object, HttpLib2Error=type('HttpLib2Error', (Exception,), {}))
+_stub_module('google_auth_httplib2', AuthorizedHttp=object)
+_stub_module('google.oauth2.credentials', Credentials=object)
+_stub_module('google_auth_oauthlib.flow', InstalledAppFlow=object)
+_stub_module('google.auth.transport.requests', Request=object)
+_stub_module('googleapiclient.discovery', build=None)
+_stub_module('googleapiclient.errors', HttpError=_HttpError)
+_stub_module('googleapiclient.model', JsonModel=object)
+
+from drive_forensic_tool import DriveForensicTool
+from googleapiclient.errors import HttpError
+
+
+class _Response(dict):
+    def __init__(self, status):
+        super().__init__(status=str(status))
+        self.status = status
+        self.reason = 'Not Found'
+
+
+class _Request:
+    def __init__(self, response):
+        self.response = response
+    
+    def execute(self, http=None):
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+class _Batch:
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+    
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+    
+    def execute(self, http=None):
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.execute(), None)
+            except HttpError as error:
+                self.callback(request_id, None, error)
+
+
+class _Files:
+    def __init__(self, files):
+        self.files = files
+    
+    def get(self, fileId, fields=None, supportsAllDrives=None):
+        if fileId not in self.files:
+            return _Request(HttpError(_Response(404), b'File not found'))
+        return _Request(dict(self.files[fileId]))
+
+
+class _Service:
+    """Just enough of the Drive v3 service for metadata re-captures"""
+    
+    def __init__(self, files):
+        self._files = _Files(files)
+    
+    def files(self):
+        return self._files
+    
+    def new_batch_http_request(self, callback=None):
+        return _Batch(callback)
+
+
+class RecaptureTest(unittest.TestCase):
+    
+    def test_recaptured_unchanged_file_is_not_changed(self):
+        metadata = {'id': 'a', 'name': 'a.docx', 'modifiedTime': '2025-01-01T00:00:00.000Z'}
+        baseline = [{
+            'file_id': 'a',
+            'fetch_time': '2025-01-01T10:00:00',
+            'metadata': metadata,
+            'revisions': [{'id': '1'}],
+            'revision_count': 1,
+        }]
+        
+        tool = DriveForensicTool()
+        tool.service = _Service({'a': metadata})
+        post = tool.recapture_comprehensive(baseline, changed_ids=set())
+        self.assertNotEqual(post[0]['fetch_time'], baseline[0]['fetch_time'])
+        
+        before, after = StreamingHash(), StreamingHash()
+        for record in baseline:
+            before.update(record)
+        for record in post:
+            after.update(record)
+        
+        self.assertEqual(changed_file_ids(['a'], before.item_hashes, after.item_hashes), [])
+    
+    def test_unchanged_file_without_metadata_is_fetched_in_full(self):
+        metadata = {'id': 'a', 'name': 'a.docx'}
+        baseline = [
+            {'file_id': 'a', 'metadata': metadata, 'revision_count': 0},
+            {'file_id': 'b', 'metadata': {'id': 'b', 'name': 'b.docx'}, 'revision_count': 0},
+        ]
+        
+        tool = DriveForensicTool()
+        # 'b' is missing from the service, so its batched metadata lookup fails
+        tool.service = _Service({'a': metadata})
+        fetched = []
+        
+        def bulk_comprehensive(file_ids, on_result=None):
+            fetched.extend(file_ids)
+            return [{'file_id': file_id, 'metadata': {'id': file_id}} for file_id in file_ids]
+        
+        tool.bulk_comprehensive = bulk_comprehensive
+        post = tool.recapture_comprehensive(baseline, changed_ids=set())
+        
+        self.assertEqual(fetched, ['b'])
+        self.assertEqual([record['file_id'] for record in post], ['a', 'b'])
+        self.assertTrue(all(record.get('metadata') for record in post))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for forensic_verifier
+Run from the repository root: python -m unittest discover tests
+"""
+
+import hashlib
+import json
+import unittest
+
+from forensic_verifier import ForensicVerifier, StreamingHash, changed_file_ids, record_digest
+
+
+def _record(file_id, fetch_time, modified='2025-01-01T00:00:00.000Z'):
+    """A comprehensive record as captured by DriveForensicTool"""
+    return {
+        'file_id': file_id,
+        'fetch_time': fetch_time,
+        'metadata': {'id': file_id, 'name': f'{file_id}.docx', 'modifiedTime': modified},
+        'revisions': [{'id': '1'}],
+        'revision_count': 1,
+    }
+
+
+def _capture(records):
+    hasher = StreamingHash()
+    for record in records:
+        hasher.update(record)
+    return hasher
+
+
+class StreamingHashTest(unittest.TestCase):
+    
+    def test_matches_generate_hash(self):
+        records = [_record('a', 't1'), _record('b', 't1')]
+        self.assertEqual(_capture(records).hexdigest(), ForensicVerifier().generate_hash(records))
+    
+    def test_update_returns_canonical_json(self):
+        record = _record('a', 't1')
+        self.assertEqual(StreamingHash().update(record), json.dumps(record, sort_keys=True).encode('utf-8'))
+    
+    def test_record_digest_leaves_out_fetch_time(self):
+        record = _record('a', 't1')
+        del record['fetch_time']
+        expected = hashlib.sha256(json.dumps(record, sort_keys=True).encode('utf-8')).hexdigest()
+        self.assertEqual(record_digest(_record('a', 't1')), expected)
+        self.assertEqual(_capture([_record('a', 't1')]).item_hashes, [expected])
+    
+    def test_recaptured_unchanged_file_is_not_changed(self):
+        baseline = _capture([_record('a', '2025-01-01T10:00:00')])
+        post = _capture([_record('a', '2025-01-02T12:30:00')])
+        
+        self.assertEqual(changed_file_ids(['a'], baseline.item_hashes, post.item_hashes), [])
+    
+    def test_modified_file_is_changed(self):
+        baseline = _capture([_record('a', 't1'), _record('b', 't1')])
+        post = _capture([_record('a', 't2'), _record('b', 't2', modified='2025-02-01T00:00:00.000Z')])
+        
+        self.assertEqual(changed_file_ids(['a', 'b'], baseline.item_hashes, post.item_hashes), ['b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
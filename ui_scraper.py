@@ -14,21 +14,27 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
 
 # ==============================================================================
 # DUPLICATE FILE HANDLING FUNCTIONS (same as screenshot_tool.py)
 # ==============================================================================
 
+# Trailing index notation: [2], #2 or (2)
+_INDEX_RE = re.compile(r'\s*(?:\[(\d+)\]|#(\d+)|\((\d+)\))\s*$')
+
+
 def parse_index_from_search(search_term: str):
     """Parse index notation from search term"""
-    patterns = [r'\s*\[(\d+)\]\s*$', r'\s*#(\d+)\s*$', r'\s*\((\d+)\)\s*$']
-    
-    for pattern in patterns:
-        match = re.search(pattern, search_term)
-        if match:
-            index = int(match.group(1))
-            clean_term = re.sub(pattern, '', search_term).strip()
-            return (clean_term, index)
+    match = _INDEX_RE.search(search_term)
+    if match:
+        index = int(next(group for group in match.groups() if group))
+        clean_term = search_term[:match.start()].strip()
+        return (clean_term, index)
     
     return (search_term, None)
 
@@ -44,7 +50,10 @@ def calculate_similarity(search_term: str, candidate: str) -> float:
     if search_lower in candidate_lower:
         return 0.85 + (0.15 * len(search_lower) / len(candidate_lower))
     
-    base_similarity = SequenceMatcher(None, search_lower, candidate_lower).ratio()
+    if fuzz is not None:
+        base_similarity = fuzz.ratio(search_lower, candidate_lower) / 100
+    else:
+        base_similarity = SequenceMatcher(None, search_lower, candidate_lower).ratio()
     
     search_words = set(search_lower.split())
     candidate_words = set(candidate_lower.split())